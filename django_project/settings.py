@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,6 +49,8 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    # ETags and 304s for pages; the event data views set their own
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -82,6 +85,11 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            # WAL lets requests keep reading while ingest_events writes
+            "init_command": "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;",
+            "transaction_mode": "IMMEDIATE",
+        },
     }
 }
 
@@ -122,6 +130,37 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Extraction output shared with the extract container
+EXTRACTION_DIR = Path(os.getenv("EXTRACTION_DIR", "./extraction"))
+
+# How often (in seconds) the in-process event cache stats EXTRACTION_DIR for
+# changed files. 0 checks on every request.
+EVENT_CACHE_CHECK_INTERVAL = float(os.getenv("EVENT_CACHE_CHECK_INTERVAL", "5"))
+
+# Cache-Control max-age (seconds) for the event data endpoints, and how many
+# compressed response bodies to keep across data versions and queries
+EVENT_DATA_MAX_AGE = int(os.getenv("EVENT_DATA_MAX_AGE", "60"))
+COMPRESSED_CACHE_ENTRIES = int(os.getenv("COMPRESSED_CACHE_ENTRIES", "256"))
+
+# How often (in seconds) each open /api/events/updates stream checks for a new
+# data version, and how long a stream stays open before the browser reconnects
+EVENT_UPDATES_POLL_INTERVAL = float(os.getenv("EVENT_UPDATES_POLL_INTERVAL", "5"))
+EVENT_UPDATES_MAX_SECONDS = float(os.getenv("EVENT_UPDATES_MAX_SECONDS", "300"))
+
+# Where manage.py publish_static writes the pre-rendered page and data for
+# nginx, and how many past releases it keeps for pages still open on them
+PUBLISH_DIR = Path(os.getenv("PUBLISH_DIR", "./public"))
+PUBLISH_KEEP_RELEASES = int(os.getenv("PUBLISH_KEEP_RELEASES", "3"))
+
+# Where manage.py load_test appends its results, one JSON line per run
+BENCHMARK_RESULTS = Path(os.getenv("BENCHMARK_RESULTS", BASE_DIR / "benchmarks" / "results.jsonl"))
+
+# Per-venue extraction metrics written by the extract container
+METRICS_DIR = EXTRACTION_DIR / "metrics"
+# Bearer token that unlocks /metrics and /api/metrics through the proxy;
+# without it they answer only requests made directly from internal addresses
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -17,7 +17,7 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path
-from pages import views
+from pages import api, views
 
 urlpatterns = [
     path("breathe/", views.breathe_view),
@@ -25,5 +25,14 @@ urlpatterns = [
     path("privacy/", views.web_data_viewer),
     path("", views.events_view),
     path("about/", views.about_view, name='about'),
+    path("api/events", api.events_api, name='events_api'),
+    path("api/events/now", api.active_events_api, name='active_events_api'),
+    path("api/events/next", api.next_events_api, name='next_events_api'),
+    path("api/events/stream", api.events_stream_api, name='events_stream_api'),
+    path("api/events/updates", api.events_updates_api, name='events_updates_api'),
+    path("api/metrics", api.metrics_api, name='metrics_api'),
+    path("metrics", api.metrics_view, name='metrics'),
+    path("api/venues", api.venues_api, name='venues_api'),
+    path("api/venues/nearest", api.nearest_venues_api, name='nearest_venues_api'),
     path("admin/", admin.site.urls),
 ]
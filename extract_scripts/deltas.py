@@ -0,0 +1,105 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from output import atomic_write
+
+logger = logging.getLogger(__name__)
+
+DELTA_DIR = Path('./extraction/deltas')
+# Number of delta files kept; consumers further behind reload the snapshots
+DELTA_RETENTION = int(os.getenv("DELTA_RETENTION", "500"))
+# Fields that change on every run without the event itself changing
+VOLATILE_FIELDS = ("extracted_time",)
+
+
+def event_id(event: dict) -> str:
+    """A stable ID derived from the venue, name, start time and recurrence."""
+    identity = [event.get("eircode"), event.get("name"), event.get("start_time"), event.get("recurrence")]
+    return hashlib.sha256(json.dumps(identity, separators=(',', ':')).encode('utf-8')).hexdigest()[:16]
+
+
+def _content(event: dict) -> dict:
+    return {key: value for key, value in event.items() if key not in VOLATILE_FIELDS}
+
+
+def empty_delta() -> dict:
+    return {"added": {}, "changed": {}, "removed": set()}
+
+
+def diff_events(previous: list, current: list) -> tuple[list, dict]:
+    """
+    Give current its IDs and compare it with the previous snapshot.
+
+    Events sharing an ID are collapsed into one. An event whose content is
+    unchanged keeps its previous record, extracted_time included, so an
+    unchanged venue writes the same bytes as last time. Returns the events
+    to write and the delta from previous to them.
+    """
+    before = {event.get("id") or event_id(event): event for event in previous}
+    events = {}
+    for event in current:
+        event = dict(event, id=event_id(event))
+        events.setdefault(event["id"], event)
+
+    delta = empty_delta()
+    for id_, event in events.items():
+        old = before.get(id_)
+        if old is None:
+            delta["added"][id_] = event
+        elif _content(dict(old, id=id_)) != _content(event):
+            delta["changed"][id_] = event
+        else:
+            events[id_] = dict(old, id=id_)
+    delta["removed"] = {id_ for id_ in before if id_ not in events}
+    return list(events.values()), delta
+
+
+def merge_delta(into: dict, delta: dict):
+    """
+    Fold one venue's delta into the run's, de-duplicating by ID; an event
+    both removed and added within a run counts as changed.
+    """
+    for id_, event in delta["added"].items():
+        if id_ in into["removed"]:
+            into["removed"].discard(id_)
+            into["changed"][id_] = event
+        else:
+            into["added"][id_] = event
+    into["changed"].update(delta["changed"])
+    for id_ in delta["removed"]:
+        if into["added"].pop(id_, None) is None:
+            into["changed"].pop(id_, None)
+            into["removed"].add(id_)
+
+
+def write_delta(delta: dict, delta_dir: Path = DELTA_DIR) -> Path:
+    """
+    Write a run's delta as deltas/<run time>.json, if it holds anything.
+
+    File names sort in run order, so a consumer applies every delta newer
+    than the last one it saw. Only the newest DELTA_RETENTION are kept.
+    """
+    if not (delta["added"] or delta["changed"] or delta["removed"]):
+        return None
+    delta_dir.mkdir(parents=True, exist_ok=True)
+    run = datetime.now(timezone.utc)
+    path = delta_dir / f"{run.strftime('%Y%m%dT%H%M%S%fZ')}.json"
+    data = {
+        "run": run.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        "added": list(delta["added"].values()),
+        "changed": list(delta["changed"].values()),
+        "removed": sorted(delta["removed"]),
+    }
+    atomic_write(path, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+    logger.info(
+        f"Delta {path.name}: {len(data['added'])} added, {len(data['changed'])} changed, "
+        f"{len(data['removed'])} removed"
+    )
+
+    for old in sorted(delta_dir.glob('*.json'))[:-DELTA_RETENTION]:
+        old.unlink(missing_ok=True)
+    return path
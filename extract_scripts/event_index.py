@@ -0,0 +1,64 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+from output import atomic_write, read_events
+
+logger = logging.getLogger(__name__)
+
+# Read by the web app in place of the per-venue files; excluded from their glob
+INDEX_NAME = "index.json"
+
+VENUE_FIELDS = ("name", "url", "latitude", "longitude", "parser")
+
+
+def sort_key(event: dict) -> tuple:
+    return (event.get("start_time") or "", event.get("eircode") or "", event.get("name") or "")
+
+
+def build_index(venue_events: dict, venues: dict, now: datetime = None) -> dict:
+    """
+    Consolidate every venue's events into one index.
+
+    Holds all events sorted by start time, each venue's metadata, and the
+    ID of each venue's next event as of now. The version is a hash of the
+    events and venues, so it only changes when the data does.
+    """
+    now_iso = (now or datetime.now(timezone.utc)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    events = sorted((event for events in venue_events.values() for event in events), key=sort_key)
+
+    venue_meta = {}
+    for eircode, venue in venues.items():
+        venue_meta[eircode] = {field: venue.get(field) for field in VENUE_FIELDS}
+        venue_meta[eircode]["events"] = len(venue_events.get(eircode, []))
+
+    next_event = {}
+    for event in events:
+        eircode = event.get("eircode")
+        if eircode not in next_event and (event.get("start_time") or "") > now_iso:
+            next_event[eircode] = event.get("id")
+
+    payload = json.dumps([events, venue_meta], sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return {
+        "version": hashlib.sha256(payload).hexdigest()[:16],
+        "generated": now_iso,
+        "venues": venue_meta,
+        "next": next_event,
+        "events": events,
+    }
+
+
+def write_index(output_dir: Path, venues: dict) -> str:
+    """
+    Rebuild output_dir/index.json from the venues' current output.
+
+    The file is replaced atomically, so readers see either the previous
+    version or the new one. Returns the version written.
+    """
+    venue_events = {eircode: read_events(output_dir, eircode) for eircode in venues}
+    index = build_index(venue_events, venues)
+    atomic_write(output_dir / INDEX_NAME, json.dumps(index, separators=(',', ':')).encode('utf-8'))
+    logger.info(f"Index {index['version']}: {len(index['events'])} events from {len(venues)} venues")
+    return index["version"]
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+from output import atomic_write
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR = Path('./extraction/state')
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def load_state(eircode: str) -> dict:
+    """Load the stored HTTP validators and content hash for a venue."""
+    try:
+        with open(STATE_DIR / f"{eircode}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        logger.warning(f"Ignoring corrupt state for {eircode}: {e}")
+        return {}
+
+
+def save_state(eircode: str, state: dict):
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    atomic_write(STATE_DIR / f"{eircode}.json", json.dumps(state, indent=2).encode('utf-8'))
+
+
+def conditional_headers(state: dict) -> dict:
+    """Build If-None-Match/If-Modified-Since headers from stored validators."""
+    headers = {}
+    if state.get('etag'):
+        headers['If-None-Match'] = state['etag']
+    if state.get('last_modified'):
+        headers['If-Modified-Since'] = state['last_modified']
+    return headers
+
+
+def update_validators(state: dict, response):
+    """Remember the validators the server sent with a response."""
+    if response.headers.get('ETag'):
+        state['etag'] = response.headers['ETag']
+    if response.headers.get('Last-Modified'):
+        state['last_modified'] = response.headers['Last-Modified']
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def is_fresh(state: dict, json_path: Path) -> bool:
+    """True when the saved output exists and its occurrence window is not yet due to roll forward."""
+    if not json_path.exists():
+        return False
+    expires = state.get('stale_after')
+    return expires is None or expires > _now_iso()
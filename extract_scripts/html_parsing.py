@@ -0,0 +1,27 @@
+import os
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+def _default_backend() -> str:
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+# HTML_PARSER_BACKEND=html.parser and HTML_PARTIAL_PARSE=0 restore the old
+# behaviour of building the whole tree with the pure-Python parser.
+PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND") or _default_backend()
+PARTIAL_PARSE = os.getenv("HTML_PARTIAL_PARSE", "1") != "0"
+
+
+def make_soup(html: str, parse_only: SoupStrainer = None) -> BeautifulSoup:
+    """
+    Parse html with the configured backend.
+
+    When partial parsing is enabled only the elements matched by parse_only
+    (and their descendants) are built into the tree.
+    """
+    return BeautifulSoup(html, PARSER_BACKEND, parse_only=parse_only if PARTIAL_PARSE else None)
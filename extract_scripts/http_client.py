@@ -0,0 +1,138 @@
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+logger = logging.getLogger(__name__)
+
+# Defaults for every fetch. A venue can override any of these through the
+# "http" entry of its VENUE_CONFIG, e.g. {"read_timeout": 60, "max_retries": 5}.
+DEFAULT_SETTINGS = {
+    "connect_timeout": float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+    "read_timeout": float(os.getenv("HTTP_READ_TIMEOUT", "30")),
+    "max_retries": int(os.getenv("HTTP_MAX_RETRIES", "3")),
+    "backoff_base": float(os.getenv("HTTP_BACKOFF_BASE", "0.5")),
+    "backoff_max": float(os.getenv("HTTP_BACKOFF_MAX", "8")),
+    # Longest Retry-After a 429 or 503 is honoured for; beyond it the
+    # response is returned rather than waiting
+    "retry_after_max": float(os.getenv("HTTP_RETRY_AFTER_MAX", "60")),
+}
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+USER_AGENT = "local-local-extractor (+https://atyourblock.com)"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "User-Agent": USER_AGENT,
+                # Every encoding urllib3 can decode here (gzip, deflate, plus br/zstd when installed)
+                "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+            })
+            _session = session
+        return _session
+
+
+def _backoff(attempt: int, settings: dict) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(settings["backoff_max"], settings["backoff_base"] * 2 ** attempt))
+
+
+def _retry_after(response: requests.Response) -> float:
+    """
+    Seconds the server asked us to wait before retrying, from a Retry-After
+    of either delay-seconds or an HTTP date, or None if it gave none.
+    """
+    value = response.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _wire_bytes(response: requests.Response) -> int:
+    """Bytes read off the wire for the body, before any decompression."""
+    try:
+        return response.raw.tell()
+    except AttributeError:
+        return len(response.content)
+
+
+def fetch(url: str, headers: dict = None, stats: dict = None, deadline: float = None, **overrides) -> requests.Response:
+    """
+    GET url through the shared session.
+
+    Connection errors, timeouts and retryable statuses are retried up to
+    max_retries times. The last response is returned as-is so callers can
+    still inspect 304s and call raise_for_status().
+
+    A 429 or 503 with Retry-After waits as long as the server asks, up to
+    retry_after_max. No wait runs past deadline, a time.monotonic() value:
+    when the next attempt could not start before it, the last response
+    is returned (or the last error raised) instead.
+
+    If stats is given it is filled in for the last attempt: attempts, wait_s
+    (request sent to headers read, which includes any DNS lookup and connect
+    for a new connection; requests does not time those separately),
+    transfer_s (reading the body) and bytes (body size on the wire).
+    """
+    settings = {**DEFAULT_SETTINGS, **overrides}
+    timeout = (settings["connect_timeout"], settings["read_timeout"])
+    session = get_session()
+
+    for attempt in range(settings["max_retries"] + 1):
+        last_attempt = attempt == settings["max_retries"]
+        if stats is not None:
+            stats["attempts"] = attempt + 1
+        try:
+            started = time.perf_counter()
+            response = session.get(url, headers=headers, timeout=timeout)
+            if stats is not None:
+                wait = response.elapsed.total_seconds()
+                stats["wait_s"] = round(wait, 4)
+                stats["transfer_s"] = round(max(0.0, time.perf_counter() - started - wait), 4)
+                stats["bytes"] = _wire_bytes(response)
+            if response.status_code not in RETRY_STATUSES or last_attempt:
+                return response
+            reason = f"HTTP {response.status_code}"
+            delay = _backoff(attempt, settings)
+            retry_after = _retry_after(response) if response.status_code in (429, 503) else None
+            if retry_after is not None:
+                if retry_after > settings["retry_after_max"]:
+                    logger.warning(f"Fetching {url} failed ({reason}), not retrying: Retry-After is {retry_after:.0f}s")
+                    return response
+                delay = retry_after
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                return response
+        except (requests.ConnectionError, requests.Timeout) as e:
+            delay = _backoff(attempt, settings)
+            if last_attempt or (deadline is not None and time.monotonic() + delay >= deadline):
+                raise
+            reason = str(e)
+
+        logger.warning(f"Fetching {url} failed ({reason}), retrying in {delay:.1f}s")
+        time.sleep(delay)
@@ -0,0 +1,107 @@
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from output import atomic_write
+
+logger = logging.getLogger(__name__)
+
+METRICS_DIR = Path('./extraction/metrics')
+# runs.jsonl is rotated to runs.jsonl.1 once it grows past this
+MAX_LOG_BYTES = int(os.getenv("METRICS_MAX_LOG_BYTES", str(5 * 1024 * 1024)))
+
+# Cache outcomes
+NOT_MODIFIED = "not_modified"  # 304 with fresh output, nothing parsed
+REGION_UNCHANGED = "region_unchanged"  # Parsed region hashed the same as last run
+MISS = "miss"
+
+# Prometheus gauges rendered from each venue's latest record: name, record key, help
+GAUGES = [
+    ("extraction_fetch_wait_seconds", "wait_s", "Time from sending the request to reading the response headers"),
+    ("extraction_fetch_transfer_seconds", "transfer_s", "Time spent reading the response body"),
+    ("extraction_fetch_attempts", "attempts", "Requests made, including retries"),
+    ("extraction_bytes_downloaded", "bytes", "Response body size as sent on the wire"),
+    ("extraction_parse_seconds", "parse_s", "Time spent parsing the page"),
+    ("extraction_events", "events", "Events the parser produced"),
+    ("extraction_occurrences", "occurrences", "Occurrences written after recurrence expansion"),
+    ("extraction_last_run_timestamp_seconds", "timestamp", "When the venue last ran"),
+]
+
+
+def new_record(eircode: str) -> dict:
+    return {"eircode": eircode, "cache": MISS, "error": None, "error_stage": None}
+
+
+def record_error(record: dict, stage: str, error: BaseException):
+    record["error"] = type(error).__name__
+    record["error_stage"] = stage
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus(latest: dict) -> str:
+    """Prometheus text exposition of each venue's latest record."""
+    lines = []
+    for name, key, help_text in GAUGES:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for eircode, record in sorted(latest.items()):
+            if record.get(key) is not None:
+                lines.append(f'{name}{{eircode="{_escape(eircode)}"}} {record[key]}')
+
+    lines += ["# HELP extraction_cache_hit Whether the venue's last run was served from cache, by kind",
+              "# TYPE extraction_cache_hit gauge"]
+    for eircode, record in sorted(latest.items()):
+        for kind in (NOT_MODIFIED, REGION_UNCHANGED):
+            lines.append(f'extraction_cache_hit{{eircode="{_escape(eircode)}",kind="{kind}"}} {int(record["cache"] == kind)}')
+
+    lines += ["# HELP extraction_error Whether the venue's last run failed, by error type and stage",
+              "# TYPE extraction_error gauge"]
+    for eircode, record in sorted(latest.items()):
+        if record.get("error"):
+            lines.append(
+                f'extraction_error{{eircode="{_escape(eircode)}",type="{_escape(record["error"])}",'
+                f'stage="{_escape(record["error_stage"])}"}} 1'
+            )
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics(records: list[dict], metrics_dir: Path = METRICS_DIR):
+    """
+    Persist one run's per-venue records.
+
+    Records are appended to runs.jsonl as history, and merged into
+    latest.json, from which extraction.prom is re-rendered, so the
+    Prometheus view covers every venue even though each run covers only
+    the venues that were due.
+    """
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    now = datetime.now(timezone.utc)
+    for record in records:
+        record["run"] = now.strftime('%Y-%m-%dT%H:%M:%SZ')
+        record["timestamp"] = int(now.timestamp())
+
+    log_path = metrics_dir / "runs.jsonl"
+    if log_path.exists() and log_path.stat().st_size > MAX_LOG_BYTES:
+        os.replace(log_path, metrics_dir / "runs.jsonl.1")
+    with open(log_path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    latest_path = metrics_dir / "latest.json"
+    try:
+        latest = json.loads(latest_path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        latest = {}
+    except json.JSONDecodeError as e:
+        logger.warning(f"Ignoring corrupt {latest_path.name}: {e}")
+        latest = {}
+    # Merged rather than replaced, so a venue skipped as not modified keeps
+    # the parse time and event counts of its last parse
+    for record in records:
+        latest[record["eircode"]] = {**latest.get(record["eircode"], {}), **record}
+    atomic_write(latest_path, json.dumps(latest, indent=2).encode('utf-8'))
+    atomic_write(metrics_dir / "extraction.prom", render_prometheus(latest).encode('utf-8'))
@@ -0,0 +1,104 @@
+import gzip
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# json: indented JSON array (the original format)
+# min: minified JSON array
+# gzip: minified JSON array, gzip-compressed
+# ndjson: one minified JSON event per line
+OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "min")
+
+SUFFIXES = {
+    "json": ".json",
+    "min": ".json",
+    "gzip": ".json.gz",
+    "ndjson": ".ndjson",
+}
+
+
+def atomic_write(path: Path, data: bytes):
+    """
+    Replace path with data so readers see either the old or the new file.
+
+    The data goes to a temporary file in the same directory, which is
+    fsynced and renamed over path, and the directory is fsynced so the
+    rename itself survives a crash.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def encode_events(events: list, output_format: str = OUTPUT_FORMAT) -> bytes:
+    if output_format == "json":
+        return json.dumps(events, indent=2).encode('utf-8')
+    if output_format == "ndjson":
+        return ''.join(json.dumps(event, separators=(',', ':')) + '\n' for event in events).encode('utf-8')
+    minified = json.dumps(events, separators=(',', ':')).encode('utf-8')
+    if output_format == "gzip":
+        # mtime=0 keeps the bytes identical for identical events
+        return gzip.compress(minified, mtime=0)
+    return minified
+
+
+def decode_events(path: Path, data: bytes) -> list:
+    """Inverse of encode_events, picking the format from the file name."""
+    if path.name.endswith('.json.gz'):
+        data = gzip.decompress(data)
+    if path.suffix == '.ndjson':
+        return [json.loads(line) for line in data.splitlines() if line.strip()]
+    return json.loads(data)
+
+
+def events_path(output_dir: Path, eircode: str, output_format: str = OUTPUT_FORMAT) -> Path:
+    return output_dir / f"{eircode}{SUFFIXES[output_format]}"
+
+
+def read_events(output_dir: Path, eircode: str) -> list:
+    """
+    A venue's last written events, in whichever format they were written,
+    or [] if there are none or they cannot be read.
+    """
+    for suffix in dict.fromkeys(SUFFIXES.values()):
+        path = output_dir / f"{eircode}{suffix}"
+        try:
+            return decode_events(path, path.read_bytes())
+        except FileNotFoundError:
+            continue
+        except (OSError, EOFError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable {path.name}: {e}")
+    return []
+
+
+def write_events(output_dir: Path, eircode: str, events: list, output_format: str = OUTPUT_FORMAT) -> Path:
+    """
+    Atomically write a venue's events in the configured format.
+
+    Copies of the venue's events in other formats are removed afterwards, so
+    switching OUTPUT_FORMAT never leaves two files for one venue.
+    """
+    if output_format not in SUFFIXES:
+        raise ValueError(f"Unknown output format {output_format!r}")
+    path = events_path(output_dir, eircode, output_format)
+    atomic_write(path, encode_events(events, output_format))
+    for suffix in set(SUFFIXES.values()) - {SUFFIXES[output_format]}:
+        (output_dir / f"{eircode}{suffix}").unlink(missing_ok=True)
+    return path
@@ -0,0 +1,380 @@
+import logging
+import re
+from datetime import date, datetime, timedelta, timezone
+
+from bs4 import SoupStrainer
+
+from html_parsing import make_soup
+from time_parsing import TIME_RANGE_RE, parse_clock, parse_time_range
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE_RE = re.compile(r'\s+')
+ZERO_WIDTH_SPACE_RE = re.compile(r'\u200b')
+TRAILING_DASH_RE = re.compile(r'\s*-\s*$')
+ORDINAL_SUFFIX_RE = re.compile(r'(?<=\d)(?:st|nd|rd|th)\b', re.IGNORECASE)
+
+
+def clean_text(text: str) -> str:
+    """Clean text by removing extra whitespace and special characters."""
+    text = WHITESPACE_RE.sub(' ', text.strip())
+    text = ZERO_WIDTH_SPACE_RE.sub('', text)  # Remove zero-width space
+    text = TRAILING_DASH_RE.sub('', text)  # Remove trailing dashes
+    text = text.replace('[&hellip;]', '')
+    return text
+
+
+def _find_args(element: dict) -> dict:
+    """
+    Turn an element spec from a venue recipe into find()/find_all() arguments.
+
+    A spec is {"name": tag, "class": css class, "attrs": {attribute: value}},
+    with every key optional.
+    """
+    args = {"name": element.get("name"), "attrs": dict(element.get("attrs", {}))}
+    if element.get("class"):
+        args["class_"] = element["class"]
+    return args
+
+
+def _element_matches(element: dict, name: str, attrs: dict) -> bool:
+    if element.get("name") and element["name"] != name:
+        return False
+    if element.get("class"):
+        classes = attrs.get("class") or []
+        if isinstance(classes, str):
+            classes = classes.split()
+        if element["class"] not in classes:
+            return False
+    return all(attrs.get(key) == value for key, value in element.get("attrs", {}).items())
+
+
+def element_strainer(*elements: dict) -> SoupStrainer:
+    """Build a SoupStrainer keeping any element matching one of the specs."""
+    return SoupStrainer(lambda name, attrs: any(_element_matches(e, name, attrs) for e in elements))
+
+
+class MassScheduleParser:
+    """
+    Weekly services read by regex from the text of one page region.
+
+    Each schedule pattern names its times with groups starting "time", and
+    produces one event per time it matches.
+    """
+
+    @staticmethod
+    def compile(recipe: dict) -> dict:
+        return {
+            "region": recipe["region"],
+            "parse_only": element_strainer(recipe["region"]),
+            "duration": recipe.get("duration", "PT1H0M"),
+            "schedules": [
+                {
+                    "name": schedule["name"],
+                    "pattern": re.compile(schedule["pattern"]),
+                    "days": schedule.get("days"),
+                }
+                for schedule in recipe["schedules"]
+            ],
+            "special_pattern": re.compile(recipe["special_pattern"]) if recipe.get("special_pattern") else None,
+        }
+
+    def __init__(self, html: str, venue_config: dict):
+        self.recipe = venue_config["recipe"]
+        self.soup = make_soup(html, self.recipe["parse_only"])
+        self.venue_config = venue_config
+        self.extracted_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    @staticmethod
+    def _parse_date(date_str: str) -> date:
+        """
+        The next date matching a day and month such as "25th December":
+        this year's, or next year's once this year's has passed.
+        """
+        try:
+            day_month = datetime.strptime(ORDINAL_SUFFIX_RE.sub('', clean_text(date_str)), '%d %B')
+        except ValueError:
+            logger.error(f"Error parsing date {date_str}")
+            return None
+        today = date.today()
+        for year in (today.year, today.year + 1):
+            try:
+                candidate = day_month.replace(year=year).date()
+            except ValueError:
+                continue  # 29th February outside a leap year
+            if candidate >= today:
+                return candidate
+        return None
+
+    def _parse_time(self, time_str: str, on: date = None) -> str:
+        """Convert time string to ISO format, on the given date if any."""
+        clock = parse_clock(time_str)
+        if clock is None:
+            logger.error(f"Error parsing time {time_str}")
+            return None
+
+        if on is not None:
+            return f"{on.isoformat()}T{clock[0]:02d}:{clock[1]:02d}:00Z"
+
+        # Get next occurrence of this time
+        now = datetime.now()
+        target_time = now.replace(hour=clock[0], minute=clock[1], second=0, microsecond=0)
+
+        # If the time has already passed today, move to tomorrow
+        if target_time <= now:
+            target_time += timedelta(days=1)
+
+        return target_time.strftime('%Y-%m-%dT%H:%M:00Z')
+
+    def _create_event(self, name: str, time_str: str, pattern="Weekly", on: date = None) -> dict:
+        """Create an event dictionary."""
+        time_iso = self._parse_time(time_str, on)
+        if not time_iso:
+            return None
+
+        return {
+            "name": f"{name} ({time_str})",
+            "start_time": time_iso,
+            "extracted_time": self.extracted_time,
+            "extracted_url": self.venue_config["url"],
+            "duration": self.recipe["duration"],
+            "recurrence": pattern,
+            "eircode": self.venue_config["eircode"],
+            "longitude": self.venue_config["longitude"],
+            "latitude": self.venue_config["latitude"]
+        }
+
+    def content_region(self) -> str:
+        """Return the part of the page the schedule is read from."""
+        content = self.soup.find(**_find_args(self.recipe["region"]))
+        return str(content) if content else ''
+
+    def parse_events(self) -> list:
+        """Extract the schedule from the page."""
+        events = []
+
+        content = self.soup.find(**_find_args(self.recipe["region"]))
+        if not content:
+            logger.error("Could not find main content")
+            return events
+
+        text = content.get_text()
+
+        # Process regular weekly services
+        for schedule in self.recipe["schedules"]:
+            match = schedule["pattern"].search(text)
+            if not match:
+                continue
+            for group, time_str in match.groupdict().items():
+                if not group.startswith('time') or not time_str:
+                    continue
+                event = self._create_event(schedule["name"], time_str, schedule["days"])
+                if event:
+                    events.append(event)
+
+        # Process special/one-off services, on their announced date; a
+        # pattern without a date group gives the next occurrence of the time
+        if self.recipe["special_pattern"]:
+            for match in self.recipe["special_pattern"].finditer(text):
+                on = None
+                date_str = match.groupdict().get('date')
+                if date_str:
+                    on = self._parse_date(date_str)
+                    if on is None:
+                        continue
+                event = self._create_event('Special Mass', match.group('time'), "ONCE", on)
+                if event:
+                    events.append(event)
+
+        return events
+
+
+class TribeEventsParser:
+    """List view of a site using The Events Calendar ("tribe") WordPress plugin."""
+
+    @staticmethod
+    def compile(recipe: dict) -> dict:
+        return {
+            **recipe,
+            # Event articles, plus the date tags that precede them in each row
+            "parse_only": element_strainer(recipe["event"], recipe["date_tag"]),
+            # Each row is a dated entry; a recipe can say "Weekly" for calendars that repeat
+            "recurrence": recipe.get("recurrence", "ONCE"),
+        }
+
+    def __init__(self, html: str, venue_config: dict):
+        self.recipe = venue_config["recipe"]
+        self.soup = make_soup(html, self.recipe["parse_only"])
+        self.venue_config = venue_config
+        self.extracted_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def _parse_time(self, event_date: str, time_text: str) -> tuple[str, str]:
+        """Parse date and time string into ISO time and duration."""
+        try:
+            event_day = date.fromisoformat(event_date)
+        except ValueError as e:
+            logger.error(f"Error parsing date: {e}")
+            return None, "Unknown"
+
+        start, duration = parse_time_range(time_text)
+        if start is None:
+            return None, "Unknown"
+        return f"{event_day.isoformat()}T{start[0]:02d}:{start[1]:02d}:00Z", duration
+
+    def content_region(self) -> str:
+        """Return the part of the page the events are read from."""
+        elements = self.soup.find_all(**_find_args(self.recipe["event"]))
+        elements += self.soup.find_all(**_find_args(self.recipe["date_tag"]))
+        return ''.join(str(e) for e in elements)
+
+    def parse_events(self) -> list[dict]:
+        """Parse all events from the HTML."""
+        events = []
+        event_rows = self.soup.find_all(**_find_args(self.recipe["event"]))
+
+        for event_row in event_rows:
+            try:
+                # Get event name
+                name_elem = event_row.find(**_find_args(self.recipe["title"]))
+                if not name_elem or not name_elem.find('a'):
+                    continue
+                name = clean_text(name_elem.find('a').text)
+
+                # Get date and time
+                datetime_elem = event_row.find(**_find_args(self.recipe["datetime"]))
+                if not datetime_elem:
+                    continue
+
+                # Extract date from parent date tag
+                date_tag = event_row.find_previous(**_find_args(self.recipe["date_tag"]))
+                if not date_tag:
+                    continue
+
+                event_date = date_tag.get('datetime')
+                if not event_date:
+                    continue
+
+                # Parse time and duration
+                time_text = datetime_elem.text.strip()
+                time_iso, duration = self._parse_time(event_date, time_text)
+
+                if not time_iso:
+                    continue
+
+                events.append({
+                    "name": name,
+                    "start_time": time_iso,
+                    "extracted_time": self.extracted_time,
+                    "extracted_url": self.venue_config["url"],
+                    "duration": duration,
+                    "recurrence": self.recipe["recurrence"],
+                    "eircode": self.venue_config["eircode"],
+                    "longitude": self.venue_config["longitude"],
+                    "latitude": self.venue_config["latitude"]
+                })
+
+            except Exception as e:
+                logger.error(f"Error parsing event: {e}")
+                continue
+
+        return events
+
+
+class WeeklyActivitiesParser:
+    """
+    A page listing activities under one heading per weekday.
+
+    Each activity is an element holding its name and time range, for
+    example "Yoga 10am - 11am", inside the content that follows the heading.
+    """
+
+    @staticmethod
+    def compile(recipe: dict) -> dict:
+        return {
+            **recipe,
+            # Day headings and the content listing each day's activities
+            "parse_only": element_strainer(recipe["day_heading"], recipe["day_content"]),
+            "recurrence": recipe.get("recurrence", "Weekly"),
+        }
+
+    def __init__(self, html: str, venue_config: dict):
+        self.recipe = venue_config["recipe"]
+        self.soup = make_soup(html, self.recipe["parse_only"])
+        self.venue_config = venue_config
+        self.extracted_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        self.today = datetime.utcnow()
+        self.day_map = {
+            "Monday": 0,
+            "Tuesday": 1,
+            "Wednesday": 2,
+            "Thursday": 3,
+            "Friday": 4,
+            "Saturday": 5,
+            "Sunday": 6,
+        }
+
+    def _parse_time(self, time_str: str, event_day: str) -> tuple[str, str]:
+        """Parse time string into ISO time and duration."""
+        start, duration = parse_time_range(time_str, default_duration="Unknown")
+        if start is None:
+            return None, "Unknown"
+
+        # Calculate event date
+        day_index = self.day_map.get(event_day)
+        if day_index is None:
+            return None, duration
+        days_ahead = (day_index - self.today.weekday() + 7) % 7
+        event_date = self.today + timedelta(days=days_ahead)
+        return f"{event_date.strftime('%Y-%m-%dT')}{start[0]:02d}:{start[1]:02d}:00Z", duration
+
+    def content_region(self) -> str:
+        """Return the part of the page the activities are read from."""
+        elements = self.soup.find_all(**_find_args(self.recipe["day_heading"]))
+        elements += self.soup.find_all(**_find_args(self.recipe["day_content"]))
+        return ''.join(str(e) for e in elements)
+
+    def parse_events(self) -> list[dict]:
+        """Parse activities from HTML."""
+        activities = []
+
+        for day_heading in self.soup.find_all(**_find_args(self.recipe["day_heading"])):
+            day = day_heading.get_text(strip=True)
+            if day not in self.day_map:
+                continue
+
+            paragraph = day_heading.find_next(**_find_args(self.recipe["day_content"]))
+            if not paragraph:
+                continue
+
+            for strong_tag in paragraph.find_all(**_find_args(self.recipe["activity"])):
+                name_and_time = strong_tag.get_text(strip=True)
+
+                # Extract times using regex
+                time_matches = TIME_RANGE_RE.findall(name_and_time)
+                if time_matches:
+                    time_str = time_matches[0]
+                    name = re.sub(time_str, '', name_and_time, flags=re.IGNORECASE).strip()
+                    time_iso, duration = self._parse_time(time_str, day)
+
+                    if time_iso:
+                        activities.append({
+                            "name": clean_text(name),
+                            "start_time": time_iso,
+                            "extracted_time": self.extracted_time,
+                            "extracted_url": self.venue_config["url"],
+                            "duration": duration,
+                            "recurrence": self.recipe["recurrence"],
+                            "eircode": self.venue_config["eircode"],
+                            "longitude": self.venue_config["longitude"],
+                            "latitude": self.venue_config["latitude"]
+                        })
+
+        return activities
+
+
+# Venue definitions refer to parsers by these names
+PARSERS = {
+    "mass_schedule": MassScheduleParser,
+    "tribe_events": TribeEventsParser,
+    "weekly_activities": WeeklyActivitiesParser,
+}
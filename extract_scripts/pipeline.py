@@ -0,0 +1,307 @@
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from urllib.parse import urlparse
+
+from deltas import diff_events, empty_delta, merge_delta, write_delta
+from event_index import INDEX_NAME, write_index
+from fetch_state import (
+    conditional_headers,
+    content_hash,
+    is_fresh,
+    load_state,
+    save_state,
+    update_validators,
+)
+from http_client import fetch
+from metrics import NOT_MODIFIED, REGION_UNCHANGED, new_record, record_error, write_metrics
+from output import events_path, read_events, write_events
+from parsers import PARSERS
+from recurrence import expand_events, next_extension
+from snapshots import collect_garbage, has_snapshot, load as load_snapshot, store as store_snapshot
+from venues import get_venues
+
+logger = logging.getLogger(__name__)
+
+# Stage sizes. EXTRACT_MAX_WORKERS=1 fetches one venue at a time.
+FETCH_WORKERS = int(os.getenv("EXTRACT_MAX_WORKERS", "8"))
+PARSE_WORKERS = int(os.getenv("EXTRACT_PARSE_WORKERS", str(os.cpu_count() or 1)))
+PER_HOST_LIMIT = int(os.getenv("EXTRACT_PER_HOST_LIMIT", "1"))
+QUEUE_SIZE = int(os.getenv("EXTRACT_QUEUE_SIZE", "16"))
+
+OUTPUT_DIR = Path('./extraction')
+
+# Per-venue outcomes reported by run_pipeline
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+_STOP = object()
+
+_host_limits = {}
+_host_limits_lock = threading.Lock()
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def _host_limit(url: str) -> threading.BoundedSemaphore:
+    """Return the semaphore limiting concurrent requests to the host of url."""
+    host = urlparse(url).hostname or url
+    with _host_limits_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return _host_limits[host]
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Parse workers are started once and reused across runs.
+
+    They are spawned rather than forked, since fetch threads may hold locks
+    (logging, the connection pool) at the moment a worker is started.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor):
+    """
+    Drop a pool broken by a worker dying, so the next parse starts a fresh
+    one. Does nothing if pool was already replaced.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not pool:
+            return
+        _process_pool = None
+    logger.error("A parse worker died; restarting the parse pool")
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _fetch_venue(venue_config: dict, parse_queue: queue.Queue, outcomes: dict, record: dict, remaining=lambda: None):
+    """
+    Fetch stage: download one venue's page and queue it for parsing.
+
+    Exactly one item is put on parse_queue per venue, None when there is
+    nothing to parse, so the dispatcher can count venues off, unless the
+    run's remaining() time runs out first. Fetch timings and any error go
+    into the venue's metrics record.
+    """
+    job = None
+    try:
+        eircode = venue_config['eircode']
+        json_path = events_path(OUTPUT_DIR, eircode)
+        state = load_state(eircode)
+
+        # Revalidate against the latest snapshot
+        headers = conditional_headers(state) if has_snapshot(eircode) else {}
+        with _host_limit(venue_config['url']):
+            left = remaining()
+            deadline = time.monotonic() + left if left is not None else None
+            response = fetch(
+                venue_config['url'], headers=headers, stats=record, deadline=deadline, **venue_config.get('http', {})
+            )
+        record['status'] = response.status_code
+
+        if response.status_code == 304:
+            if is_fresh(state, json_path):
+                logger.info(f"{eircode}: page not modified, skipping")
+                outcomes[eircode] = UNCHANGED
+                record['cache'] = NOT_MODIFIED
+                return
+            html = load_snapshot(eircode)
+            if html is None:
+                raise FileNotFoundError(f"No snapshot to re-parse for {eircode}")
+        else:
+            response.raise_for_status()
+            html = response.text
+        update_validators(state, response)
+
+        job = {
+            "venue_config": venue_config,
+            "html": html,
+            "fetched": response.status_code != 304,
+            "state": state,
+            "known_hash": state.get('content_hash') if is_fresh(state, json_path) else None,
+            "record": record,
+        }
+    except Exception as e:
+        logger.error(f"Error fetching {venue_config['eircode']}: {e}")
+        outcomes[venue_config['eircode']] = FAILED
+        record_error(record, "fetch", e)
+    finally:
+        try:
+            parse_queue.put(job, timeout=remaining())
+        except queue.Full:
+            logger.warning(f"Dropping {venue_config['eircode']}: run deadline reached")
+
+
+def _parse_page(eircode: str, html: str, known_hash: str) -> tuple[str, list, float]:
+    """
+    Parse stage, run in a worker process.
+
+    Workers look the venue up in their own compiled copy of the venue
+    definitions, so only the page itself crosses the process boundary.
+    Returns the hash of the region the parser reads, its events (None when
+    that region hashes to known_hash) and the seconds spent.
+    """
+    started = time.perf_counter()
+    venue_config = get_venues()[eircode]
+    parser = PARSERS[venue_config['parser']](html, venue_config)
+    region_hash = content_hash(parser.content_region())
+    events = None if region_hash == known_hash else parser.parse_events()
+    return region_hash, events, time.perf_counter() - started
+
+
+def _write_results(write_queue: queue.Queue, inflight: threading.Semaphore, outcomes: dict, remaining=lambda: None):
+    """
+    Writer stage: the only place extraction output is persisted.
+
+    A parse still unfinished when the run's remaining() time is up is
+    abandoned and its venue failed, so the writer always finishes the run.
+
+    Every fetched page goes into the snapshot store. Each venue's changes
+    are folded into one delta, written for the whole run once the last
+    result is in. If anything changed the consolidated index is then
+    rebuilt, and old snapshots are garbage-collected.
+    """
+    run_delta = empty_delta()
+    while True:
+        item = write_queue.get()
+        if item is _STOP:
+            try:
+                if write_delta(run_delta) or not (OUTPUT_DIR / INDEX_NAME).exists():
+                    write_index(OUTPUT_DIR, get_venues())
+                collect_garbage()
+            except Exception as e:
+                logger.error(f"Error finishing run: {e}")
+            return
+        job, future, pool = item
+        eircode = job['venue_config']['eircode']
+        state = job['state']
+        record = job['record']
+        stage = "parse"
+        try:
+            try:
+                region_hash, activities, parse_seconds = future.result(timeout=remaining())
+            except TimeoutError:
+                future.cancel()
+                logger.warning(f"{eircode}: run deadline reached, abandoning its parse")
+                outcomes[eircode] = FAILED
+                record.update(error="DeadlineExceeded", error_stage="deadline")
+                continue
+            record['parse_s'] = round(parse_seconds, 4)
+            stage = "write"
+            if job['fetched']:
+                store_snapshot(eircode, job['html'])
+            # A re-parse of an unchanged page to roll the window forward still counts as unchanged
+            outcomes[eircode] = CHANGED if region_hash != state.get('content_hash') else UNCHANGED
+            if activities is None:
+                record['cache'] = REGION_UNCHANGED
+                save_state(eircode, state)
+                logger.info(f"{eircode}: content unchanged, skipping")
+                continue
+            record['events'] = len(activities)
+
+            occurrences, state['recurrence'] = expand_events(activities, state.get('recurrence', {}))
+            occurrences, delta = diff_events(read_events(OUTPUT_DIR, eircode), occurrences)
+            write_events(OUTPUT_DIR, eircode, occurrences)
+            merge_delta(run_delta, delta)
+            record['occurrences'] = len(occurrences)
+
+            state['content_hash'] = region_hash
+            # Re-parsed once this passes, which rolls the occurrence window forward
+            state['stale_after'] = next_extension()
+            save_state(eircode, state)
+            logger.info(f"{eircode}: saved {len(occurrences)} occurrences of {len(activities)} activities")
+        except Exception as e:
+            logger.error(f"Error processing {eircode}: {e}")
+            outcomes[eircode] = FAILED
+            record_error(record, stage, e)
+            if isinstance(e, BrokenProcessPool):
+                _discard_process_pool(pool)
+        finally:
+            inflight.release()
+
+
+def run_pipeline(venues: list[dict], deadline: float = None) -> dict:
+    """
+    Fetch, parse and save the given venues.
+
+    I/O-bound fetch threads feed a process pool of parsers through a bounded
+    queue, and a single writer thread persists results in submission order.
+    The writer frees an in-flight slot per result, so a slow stage blocks the
+    ones before it rather than buffering pages in memory. Venues unfinished
+    after deadline seconds are abandoned. Per-venue metrics for the run are
+    written to metrics.METRICS_DIR.
+
+    Returns each venue's outcome (CHANGED, UNCHANGED or FAILED) by eircode.
+    """
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    end = time.monotonic() + deadline if deadline else None
+    remaining = lambda: max(0, end - time.monotonic()) if end else None
+
+    parse_queue = queue.Queue(maxsize=QUEUE_SIZE)
+    write_queue = queue.Queue()
+    outcomes = {}
+    records = {v['eircode']: new_record(v['eircode']) for v in venues}
+    inflight = threading.Semaphore(PARSE_WORKERS * 2)
+    writer = threading.Thread(
+        target=_write_results, args=(write_queue, inflight, outcomes, remaining), name="extract-writer", daemon=True
+    )
+    writer.start()
+
+    fetchers = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="extract-fetch")
+    for venue_config in venues:
+        fetchers.submit(_fetch_venue, venue_config, parse_queue, outcomes, records[venue_config['eircode']], remaining)
+
+    try:
+        for _ in venues:
+            job = parse_queue.get(timeout=remaining())
+            if job is None:
+                continue
+            if not inflight.acquire(timeout=remaining()):
+                raise queue.Empty
+            eircode = job['venue_config']['eircode']
+            pool = _get_process_pool()
+            try:
+                future = pool.submit(_parse_page, eircode, job['html'], job['known_hash'])
+            except BrokenProcessPool as e:
+                logger.error(f"Error parsing {eircode}: {e}")
+                outcomes[eircode] = FAILED
+                record_error(job['record'], "parse", e)
+                _discard_process_pool(pool)
+                inflight.release()
+                continue
+            write_queue.put((job, future, pool))
+    except queue.Empty:
+        logger.warning(f"Run deadline of {deadline}s reached before all venues were fetched")
+    finally:
+        fetchers.shutdown(wait=False, cancel_futures=True)
+        write_queue.put(_STOP)
+
+    # Parses past the deadline are abandoned by the writer itself, so this
+    # returns soon after it; the next run never overlaps this one's writes
+    writer.join()
+
+    results = {v['eircode']: outcomes.get(v['eircode'], FAILED) for v in venues}
+    for eircode, record in records.items():
+        record['outcome'] = results[eircode]
+        if results[eircode] == FAILED and not record['error']:
+            record.update(error="DeadlineExceeded", error_stage="deadline")
+    try:
+        write_metrics([dict(record) for record in records.values()])
+    except Exception as e:
+        logger.error(f"Error writing metrics: {e}")
+    return results
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+# How far ahead occurrences are materialised
+WINDOW = timedelta(weeks=float(os.getenv("RECURRENCE_WINDOW_WEEKS", "8")))
+# Occurrences this far in the past are kept, so today's calendar stays full
+KEEP_PAST = timedelta(days=1)
+# How often a venue's window is rolled forward when its page is unchanged
+EXTEND_EVERY = timedelta(hours=float(os.getenv("RECURRENCE_EXTEND_HOURS", "24")))
+
+WEEKDAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY"]
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def _parse(timestamp: str) -> datetime:
+    return datetime.strptime(timestamp, TIME_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def _format(moment: datetime) -> str:
+    return moment.strftime(TIME_FORMAT)
+
+
+def rule_for(event: dict) -> dict:
+    """
+    The rule behind a parsed event.
+
+    Parsers emit one instance per event with recurrence set to "ONCE", a
+    list of weekdays, or "Weekly" (meaning the weekday of its start time).
+    A weekly rule starts at the event's own start time, so a dated event
+    never gains occurrences before it.
+    """
+    start = _parse(event["start_time"])
+    recurrence = event.get("recurrence")
+    if isinstance(recurrence, list):
+        days = sorted({WEEKDAYS.index(day.upper()) for day in recurrence if day.upper() in WEEKDAYS})
+    elif isinstance(recurrence, str) and recurrence.lower() == "weekly":
+        days = [start.weekday()]
+    else:
+        days = None
+    if not days:
+        return {"freq": "once", "start": event["start_time"]}
+    return {"freq": "weekly", "days": days, "time": start.strftime('%H:%M'), "start": event["start_time"]}
+
+
+def rule_key(event: dict, rule: dict) -> str:
+    """
+    Identifies a rule across runs: the venue, event name and rule itself.
+    A weekly rule's start is left out, since parsers of open-ended schedules
+    move it forward every run.
+    """
+    if rule["freq"] == "weekly":
+        rule = {key: value for key, value in rule.items() if key != "start"}
+    identity = [event.get("eircode"), event.get("name"), rule]
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def occurrences_between(rule: dict, start: datetime, end: datetime) -> list[str]:
+    """Start times of rule's occurrences in [start, end), in order."""
+    if rule["freq"] == "once":
+        return [rule["start"]] if start <= _parse(rule["start"]) < end else []
+    start = max(start, _parse(rule["start"]))
+
+    hour, minute = (int(part) for part in rule["time"].split(':'))
+    days = set(rule["days"])
+    found = []
+    day = start.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    while day < end:
+        if day.weekday() in days and day >= start:
+            found.append(_format(day))
+        day += timedelta(days=1)
+    return found
+
+
+def expand_events(events: list, cache: dict, now: datetime = None) -> tuple[list, dict]:
+    """
+    Expand parsed events into concrete occurrences over the rolling window.
+
+    cache is what the previous call returned for the same venue: each rule's
+    occurrence start times and the time they run until. A rule seen before
+    keeps its cached occurrences, loses the ones now outside the window and
+    is extended by only the days since its last expansion; new rules are
+    expanded in full. Returns the occurrences, sorted by start time, and the
+    cache for the next call, holding just the rules seen this time.
+    """
+    now = now or datetime.now(timezone.utc)
+    window_start = (now - KEEP_PAST).replace(second=0, microsecond=0)
+    window_end = (now + WINDOW).replace(second=0, microsecond=0)
+    window_start_iso = _format(window_start)
+
+    occurrences = []
+    new_cache = {}
+    for event in events:
+        rule = rule_for(event)
+        key = rule_key(event, rule)
+        if key in new_cache:
+            continue  # The same rule listed twice on a page
+        entry = cache.get(key)
+        if entry:
+            starts = [s for s in entry["starts"] if s >= window_start_iso and s >= rule["start"]]
+            until = max(_parse(entry["until"]), window_start)
+            starts += occurrences_between(rule, until, window_end)
+        else:
+            starts = occurrences_between(rule, window_start, window_end)
+        new_cache[key] = {"rule": rule, "until": _format(window_end), "starts": starts}
+        occurrences.extend(dict(event, start_time=start) for start in starts)
+
+    occurrences.sort(key=lambda occurrence: occurrence["start_time"])
+    return occurrences, new_cache
+
+
+def next_extension(now: datetime = None) -> str:
+    """When a venue's window should next be rolled forward."""
+    return _format((now or datetime.now(timezone.utc)) + EXTEND_EVERY)
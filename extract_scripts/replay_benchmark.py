@@ -0,0 +1,152 @@
+"""
+Replay saved venue pages through the parsers, with no network access.
+
+    python replay_benchmark.py --corpus ./extraction --runs 50
+    python replay_benchmark.py --save-baseline baseline.json
+    python replay_benchmark.py --baseline baseline.json
+    python replay_benchmark.py --at 2026-01-31T00:00:00Z
+
+Each parser is timed over --runs parses of its venue's saved
+<eircode>.html, then run once more under tracemalloc for peak memory.
+Venues without one are replayed from the snapshot store in the corpus,
+using the page as fetched at --at (default: the latest fetch).
+"""
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from parsers import PARSERS
+from snapshots import load as load_snapshot
+from venues import get_venues
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Fields that change from run to run without the page changing
+VOLATILE_FIELDS = {"extracted_time"}
+
+
+def run_parser(venue: dict, html: str) -> list:
+    return PARSERS[venue["parser"]](html, venue).parse_events()
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def benchmark(venue: dict, html: str, runs: int) -> dict:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        events = run_parser(venue, html)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run_parser(venue, html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "parser": PARSERS[venue["parser"]].__name__,
+        "bytes": len(html.encode("utf-8")),
+        "runs": runs,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p90_ms": percentile(timings, 90) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "mean_ms": statistics.mean(timings) * 1000,
+        "peak_kb": peak / 1024,
+        "events": len(events),
+        "output": events,
+    }
+
+
+def normalise(events: list) -> list:
+    """
+    Strip output down to what should only change when the page does.
+
+    Weekly parsers roll start times forward to the next occurrence after
+    "now", so only the time of day is compared.
+    """
+    normalised = []
+    for event in events:
+        event = {k: v for k, v in event.items() if k not in VOLATILE_FIELDS}
+        if event.get("start_time"):
+            event["start_time"] = event["start_time"][11:]
+        normalised.append(event)
+    return normalised
+
+
+def diff_baseline(results: dict, baseline: dict) -> list[str]:
+    problems = []
+    for eircode, result in results.items():
+        if eircode not in baseline:
+            problems.append(f"{eircode}: not in baseline")
+            continue
+        expected = baseline[eircode]
+        actual = normalise(result["output"])
+        if actual == expected:
+            continue
+        missing = [e for e in expected if e not in actual]
+        added = [e for e in actual if e not in expected]
+        problems.append(f"{eircode}: {len(missing)} events missing, {len(added)} new")
+        for event in missing:
+            problems.append(f"  - {event['name']} {event.get('start_time')}")
+        for event in added:
+            problems.append(f"  + {event['name']} {event.get('start_time')}")
+    return problems
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--corpus", type=Path, default=Path("./extraction"),
+                            help="directory of saved <eircode>.html pages")
+    arg_parser.add_argument("--at", help="replay snapshots as fetched at this ISO time")
+    arg_parser.add_argument("--runs", type=int, default=20, help="timed parses per page")
+    arg_parser.add_argument("--baseline", type=Path, help="diff parser output against this baseline")
+    arg_parser.add_argument("--save-baseline", type=Path, help="write parser output as a new baseline")
+    arg_parser.add_argument("--output", type=Path, help="write timings as JSON")
+    args = arg_parser.parse_args()
+
+    results = {}
+    for eircode, venue in get_venues().items():
+        html_path = args.corpus / f"{eircode}.html"
+        if html_path.exists() and not args.at:
+            html = html_path.read_text(encoding="utf-8")
+        else:
+            html = load_snapshot(eircode, args.at, args.corpus / "snapshots")
+        if html is None:
+            logger.warning(f"No saved page for {eircode} in {args.corpus}")
+            continue
+        results[eircode] = benchmark(venue, html, args.runs)
+
+    print(f"{'venue':<10} {'parser':<38} {'KB':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'peak KB':>9} {'events':>7}")
+    for eircode, r in results.items():
+        print(f"{eircode:<10} {r['parser']:<38} {r['bytes'] / 1024:>7.1f} {r['p50_ms']:>8.2f} "
+              f"{r['p90_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['peak_kb']:>9.1f} {r['events']:>7}")
+
+    if args.output:
+        timings = {eircode: {k: v for k, v in r.items() if k != "output"} for eircode, r in results.items()}
+        args.output.write_text(json.dumps(timings, indent=2), encoding="utf-8")
+
+    if args.save_baseline:
+        baseline = {eircode: normalise(r["output"]) for eircode, r in results.items()}
+        args.save_baseline.write_text(json.dumps(baseline, indent=2), encoding="utf-8")
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        problems = diff_baseline(results, json.loads(args.baseline.read_text(encoding="utf-8")))
+        if problems:
+            print("\n".join(problems))
+            sys.exit(1)
+        print("Output matches baseline")
+
+
+if __name__ == "__main__":
+    main()
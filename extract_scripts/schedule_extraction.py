@@ -1,31 +1,34 @@
-import schedule
 import time
 import logging
-import importlib
-from pathlib import Path
+import os
+
+from pipeline import run_pipeline
+from scheduler import AdaptiveScheduler
+from venues import get_venues
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def parse_websites():
-    logger.info("Starting script...")
-    scripts_dir = Path(__file__).parent
-    scripts = [f.stem for f in scripts_dir.glob("d15*.py") if f.stem != "schedule_extraction"]
+RUN_DEADLINE = float(os.getenv("EXTRACT_RUN_DEADLINE", "120"))
 
-    for module_name in scripts:
-        module = importlib.import_module(module_name)
-        func = getattr(module, f"parse_{module_name}")
-        func()
+
+def parse_websites(venues: list[dict] = None) -> dict:
+    """Run the given venues (all of them by default) and return their outcomes."""
+    logger.info("Starting script...")
+    run_start = time.monotonic()
+    if venues is None:
+        venues = list(get_venues().values())
+    outcomes = run_pipeline(venues, RUN_DEADLINE)
+    logger.info(f"Run finished in {time.monotonic() - run_start:.2f}s")
+    return outcomes
 
 
 def main():
     """Run parser on schedule."""
     logger.info("Schedule")
-    parse_websites()
-    schedule.every(6).hours.do(parse_websites)
-    while True:
-        schedule.run_pending()
-        time.sleep(10)
+    venues = get_venues()
+    logger.info(f"Loaded {len(venues)} venues")
+    AdaptiveScheduler(venues, parse_websites).run_forever()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,114 @@
+import heapq
+import json
+import logging
+import os
+import random
+import time
+from pathlib import Path
+
+from fetch_state import STATE_DIR
+from output import atomic_write
+from pipeline import CHANGED, FAILED
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+INITIAL_INTERVAL = float(os.getenv("SCHEDULE_INITIAL_HOURS", "6")) * HOUR
+MIN_INTERVAL = float(os.getenv("SCHEDULE_MIN_HOURS", "1")) * HOUR
+MAX_INTERVAL = float(os.getenv("SCHEDULE_MAX_HOURS", "24")) * HOUR
+# Each interval is stretched or shrunk by up to this fraction so venues drift apart
+JITTER = float(os.getenv("SCHEDULE_JITTER", "0.1"))
+# Venues due within this many seconds of each other run as one batch
+BATCH_WINDOW = 60
+# Intervals shrink this much after a change and grow this much after none
+SPEED_UP = 0.5
+SLOW_DOWN = 1.5
+
+SCHEDULE_STATE = STATE_DIR / "schedule.json"
+
+
+class AdaptiveScheduler:
+    """
+    Polls each venue on its own interval, kept in a heap by next-due time.
+
+    A venue whose content changed since its last run is polled sooner next
+    time, and one that did not is polled later, within MIN_INTERVAL and
+    MAX_INTERVAL. Intervals and due times survive restarts in SCHEDULE_STATE.
+    """
+
+    def __init__(self, venues: dict, run, state_path: Path = SCHEDULE_STATE):
+        """
+        venues maps eircode to venue definition; run takes a list of venue
+        definitions and returns {eircode: outcome} as run_pipeline does.
+        """
+        self.venues = venues
+        self.run = run
+        self.state_path = state_path
+        self.state = self._load_state()
+
+        now = time.time()
+        self.heap = []
+        for eircode in venues:
+            entry = self.state.setdefault(eircode, {"interval": INITIAL_INTERVAL})
+            # New venues start within the first batch window rather than all at once
+            due = entry.get("next_due", now + random.uniform(0, BATCH_WINDOW))
+            heapq.heappush(self.heap, (due, eircode))
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            logger.warning(f"Ignoring corrupt schedule state: {e}")
+            return {}
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.state_path, json.dumps(self.state, indent=2).encode('utf-8'))
+
+    @staticmethod
+    def _jittered(interval: float) -> float:
+        return interval * random.uniform(1 - JITTER, 1 + JITTER)
+
+    @staticmethod
+    def adapt(interval: float, outcome: str) -> float:
+        """The next interval for a venue after a run with the given outcome."""
+        if outcome == CHANGED:
+            interval *= SPEED_UP
+        elif outcome != FAILED:
+            interval *= SLOW_DOWN
+        return min(MAX_INTERVAL, max(MIN_INTERVAL, interval))
+
+    def run_due(self):
+        """Run every venue due now (or within BATCH_WINDOW) and reschedule them."""
+        now = time.time()
+        batch = []
+        while self.heap and self.heap[0][0] <= now + BATCH_WINDOW:
+            _, eircode = heapq.heappop(self.heap)
+            batch.append(eircode)
+        if not batch:
+            return
+
+        logger.info(f"Running {len(batch)} due venues: {', '.join(batch)}")
+        outcomes = self.run([self.venues[eircode] for eircode in batch])
+
+        now = time.time()
+        for eircode in batch:
+            entry = self.state[eircode]
+            outcome = outcomes.get(eircode, FAILED)
+            entry["interval"] = self.adapt(entry["interval"], outcome)
+            # A failed venue is retried soon without changing what we learned about it
+            delay = MIN_INTERVAL if outcome == FAILED else entry["interval"]
+            entry["next_due"] = now + self._jittered(delay)
+            heapq.heappush(self.heap, (entry["next_due"], eircode))
+            logger.info(f"{eircode}: {outcome}, next run in {(entry['next_due'] - now) / HOUR:.1f}h")
+        self._save_state()
+
+    def run_forever(self):
+        while self.heap:
+            delay = self.heap[0][0] - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            self.run_due()
@@ -0,0 +1,119 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from output import atomic_write
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = Path('./extraction/snapshots')
+# Index entries older than this are dropped, along with pages no entry refers to
+RETENTION_DAYS = float(os.getenv("SNAPSHOT_RETENTION_DAYS", "30"))
+# ...but each venue always keeps at least its newest few fetches
+KEEP_MIN = int(os.getenv("SNAPSHOT_KEEP_MIN", "5"))
+# Garbage collection walks every index, so it runs at most this often
+GC_INTERVAL = float(os.getenv("SNAPSHOT_GC_HOURS", "24")) * 3600
+
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def _object_path(digest: str, snapshot_dir: Path) -> Path:
+    return snapshot_dir / "objects" / digest[:2] / f"{digest}.html.gz"
+
+
+def _index_path(eircode: str, snapshot_dir: Path) -> Path:
+    return snapshot_dir / "index" / f"{eircode}.json"
+
+
+def load_index(eircode: str, snapshot_dir: Path = SNAPSHOT_DIR) -> list:
+    """A venue's fetches as [{"fetched": time, "hash": sha256}], oldest first."""
+    try:
+        return json.loads(_index_path(eircode, snapshot_dir).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return []
+    except json.JSONDecodeError as e:
+        logger.warning(f"Ignoring corrupt snapshot index for {eircode}: {e}")
+        return []
+
+
+def store(eircode: str, html: str, fetched: datetime = None, snapshot_dir: Path = SNAPSHOT_DIR) -> str:
+    """
+    Record a fetched page and return its hash.
+
+    The page is stored gzipped under its sha256, once however many fetches
+    return the same bytes; each fetch only adds an index entry.
+    """
+    data = html.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()
+    path = _object_path(digest, snapshot_dir)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, gzip.compress(data, mtime=0))
+
+    fetched = fetched or datetime.now(timezone.utc)
+    index = load_index(eircode, snapshot_dir)
+    index.append({"fetched": fetched.strftime(TIME_FORMAT), "hash": digest})
+    index_path = _index_path(eircode, snapshot_dir)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(index_path, json.dumps(index, separators=(',', ':')).encode('utf-8'))
+    return digest
+
+
+def load(eircode: str, at: str = None, snapshot_dir: Path = SNAPSHOT_DIR) -> str:
+    """
+    The page as last fetched at or before at (an ISO time; default the
+    latest fetch), or None if there is none.
+    """
+    entries = [e for e in load_index(eircode, snapshot_dir) if at is None or e["fetched"] <= at]
+    for entry in reversed(entries):
+        try:
+            return gzip.decompress(_object_path(entry["hash"], snapshot_dir).read_bytes()).decode('utf-8')
+        except FileNotFoundError:
+            logger.warning(f"Snapshot {entry['hash']} for {eircode} is missing")
+    return None
+
+
+def has_snapshot(eircode: str, snapshot_dir: Path = SNAPSHOT_DIR) -> bool:
+    return bool(load_index(eircode, snapshot_dir))
+
+
+def collect_garbage(snapshot_dir: Path = SNAPSHOT_DIR, now: datetime = None) -> int:
+    """
+    Apply the retention policy and delete pages no index refers to.
+
+    Runs at most once per GC_INTERVAL, tracked by the mtime of a marker
+    file. Returns the number of pages deleted.
+    """
+    marker = snapshot_dir / ".last_gc"
+    try:
+        if time.time() - marker.stat().st_mtime < GC_INTERVAL:
+            return 0
+    except FileNotFoundError:
+        pass
+
+    now = now or datetime.now(timezone.utc)
+    cutoff = (now - timedelta(days=RETENTION_DAYS)).strftime(TIME_FORMAT)
+    referenced = set()
+    for index_path in (snapshot_dir / "index").glob('*.json'):
+        eircode = index_path.stem
+        index = load_index(eircode, snapshot_dir)
+        kept = [e for i, e in enumerate(index) if e["fetched"] >= cutoff or i >= len(index) - KEEP_MIN]
+        if len(kept) != len(index):
+            atomic_write(index_path, json.dumps(kept, separators=(',', ':')).encode('utf-8'))
+        referenced.update(e["hash"] for e in kept)
+
+    removed = 0
+    for path in (snapshot_dir / "objects").glob('*/*.html.gz'):
+        if path.name[:-len('.html.gz')] not in referenced:
+            path.unlink(missing_ok=True)
+            removed += 1
+
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.touch()
+    logger.info(f"Snapshot GC removed {removed} pages, {len(referenced)} kept")
+    return removed
@@ -0,0 +1,79 @@
+import re
+from functools import lru_cache
+
+# A clock time such as "10am", "7:30 pm" or "7.30pm"
+TIME_RE = re.compile(r'(\d{1,2}(?:[:.]\d{2})?\s*(?:am|pm))', re.IGNORECASE)
+# A clock time optionally followed by the end of a range, e.g. "10am - 11:30"
+TIME_RANGE_RE = re.compile(
+    r'(\d{1,2}(?::\d{2})?\s*(?:am|pm)(?:\s*-\s*\d{1,2}(?::\d{2})?\s*(?:am|pm)?)?)', re.IGNORECASE
+)
+_CLOCK_RE = re.compile(r'^\s*(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm)\s*$', re.IGNORECASE)
+
+DEFAULT_DURATION = "PT1H0M"
+
+
+@lru_cache(maxsize=4096)
+def parse_clock(time_str: str) -> tuple[int, int]:
+    """
+    Convert a 12-hour clock string to (hour, minute) on the 24-hour clock.
+
+    Returns None when time_str is not a valid 12-hour time. Results are
+    memoised, since the same handful of times recur on every page and run.
+    """
+    match = _CLOCK_RE.match(time_str)
+    if not match:
+        return None
+    hour = int(match.group(1))
+    minute = int(match.group(2) or 0)
+    if not 1 <= hour <= 12 or minute > 59:
+        return None
+    if match.group(3).lower() == 'pm':
+        hour = hour % 12 + 12
+    else:
+        hour = hour % 12
+    return hour, minute
+
+
+def parse_clocks(time_strs: list[str]) -> list[tuple[int, int]]:
+    """Batch form of parse_clock, keeping None for unparseable entries."""
+    return [parse_clock(t) for t in time_strs]
+
+
+def find_times(text: str) -> list[str]:
+    """Every clock time in text, in order."""
+    return TIME_RE.findall(text)
+
+
+def minutes_between(start: tuple[int, int], end: tuple[int, int]) -> int:
+    """Minutes from start to end, treating an end at or before start as the next day."""
+    minutes = (end[0] * 60 + end[1]) - (start[0] * 60 + start[1])
+    if minutes <= 0:  # Handle overnight events
+        minutes += 24 * 60
+    return minutes
+
+
+def format_duration(minutes: int) -> str:
+    """Format minutes as an ISO 8601 duration, e.g. 90 -> "PT1H30M"."""
+    hours, minutes = divmod(minutes, 60)
+    return f"PT{hours}H{minutes}M"
+
+
+@lru_cache(maxsize=4096)
+def parse_time_range(text: str, default_duration: str = DEFAULT_DURATION) -> tuple[tuple[int, int], str]:
+    """
+    Read the first time in text as a start, and the second (if any) as an end.
+
+    Returns ((hour, minute), ISO duration), or (None, default_duration) when
+    there is no valid start time. Memoised like parse_clock.
+    """
+    clocks = parse_clocks(find_times(text)[:2])
+    if not clocks or clocks[0] is None:
+        return None, default_duration
+    if len(clocks) > 1 and clocks[1] is not None:
+        return clocks[0], format_duration(minutes_between(clocks[0], clocks[1]))
+    return clocks[0], default_duration
+
+
+def parse_time_ranges(texts: list[str], default_duration: str = DEFAULT_DURATION) -> list[tuple[tuple[int, int], str]]:
+    """Batch form of parse_time_range."""
+    return [parse_time_range(text, default_duration) for text in texts]
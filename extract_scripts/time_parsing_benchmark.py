@@ -0,0 +1,117 @@
+"""
+Micro-benchmarks for time_parsing against the per-parser code it replaced.
+
+    python time_parsing_benchmark.py --number 20000
+
+The legacy_* functions are the time handling the three parsers carried
+before time_parsing existed, kept here only as a reference point.
+"""
+import argparse
+import re
+import timeit
+from datetime import datetime
+
+from time_parsing import parse_clock, parse_clocks, parse_time_range, parse_time_ranges
+
+SAMPLE_TIMES = ["10am", "6:30pm", "10:30am", "12pm", "7:30 pm", "9am", "11:15am", "8pm"]
+SAMPLE_RANGES = [
+    "October 20 @ 10:00 am - 11:30 am",
+    "10am - 11am",
+    "7:30pm-8:30pm",
+    "2pm - 4pm",
+    "9:00 am",
+]
+
+
+def legacy_strptime(time_str: str):
+    """Mass schedule parser: two strptime formats."""
+    time_str = time_str.strip().lower().replace(' ', '')
+    if ":" in time_str:
+        return datetime.strptime(time_str, "%I:%M%p")
+    return datetime.strptime(time_str, "%I%p")
+
+
+def legacy_tribe(time_text: str):
+    """Tribe events parser: uncompiled findall/sub, strptime per time."""
+    times = re.findall(r'(\d{1,2}(?::\d{2})?\s*(?:am|pm))', time_text.lower())
+    if not times:
+        return None, "Unknown"
+    start_time = re.sub(r'\s+(am|pm)', r'\1', times[0].strip())
+    start_dt = datetime.strptime(f"2025-01-01 {start_time}", "%Y-%m-%d %I:%M%p")
+    duration = "PT1H0M"
+    if len(times) > 1:
+        end_time = re.sub(r'\s+(am|pm)', r'\1', times[1].strip())
+        end_dt = datetime.strptime(f"2025-01-01 {end_time}", "%Y-%m-%d %I:%M%p")
+        duration_mins = int((end_dt - start_dt).total_seconds() / 60)
+        if duration_mins <= 0:
+            duration_mins += 24 * 60
+        hours, minutes = divmod(duration_mins, 60)
+        duration = f"PT{hours}H{minutes}M"
+    return start_dt, duration
+
+
+def legacy_activity(time_str: str):
+    """Weekly activities parser: findall plus a closure defined per call."""
+    time_matches = re.findall(r'(\d{1,2}(?::\d{2})?\s*(?:am|pm))', time_str.lower())
+    if not time_matches:
+        return None, "Unknown"
+
+    def convert_time(t: str) -> tuple[int, int]:
+        t = t.replace('.', ':').strip()
+        meridiem = 'am' if 'am' in t else 'pm'
+        t = t.replace(meridiem, '').strip()
+        if ':' in t:
+            hour, minute = map(int, t.split(':'))
+        else:
+            hour, minute = int(t), 0
+        if meridiem == 'pm' and hour != 12:
+            hour += 12
+        elif meridiem == 'am' and hour == 12:
+            hour = 0
+        return hour, minute
+
+    start = convert_time(time_matches[0])
+    duration = "Unknown"
+    if len(time_matches) > 1:
+        end = convert_time(time_matches[1])
+        duration_mins = (end[0] * 60 + end[1]) - (start[0] * 60 + start[1])
+        if duration_mins <= 0:
+            duration_mins += 24 * 60
+        hours, minutes = divmod(duration_mins, 60)
+        duration = f"PT{hours}H{minutes}M"
+    return start, duration
+
+
+def tribe_ranges():
+    return [r for r in SAMPLE_RANGES if ':' in r.split('-')[0]]
+
+
+CASES = [
+    ("single times", lambda: [legacy_strptime(t) for t in SAMPLE_TIMES],
+     lambda: [parse_clock(t) for t in SAMPLE_TIMES]),
+    ("single times, batch", lambda: [legacy_strptime(t) for t in SAMPLE_TIMES],
+     lambda: parse_clocks(SAMPLE_TIMES)),
+    ("tribe ranges", lambda: [legacy_tribe(r) for r in tribe_ranges()],
+     lambda: [parse_time_range(r) for r in tribe_ranges()]),
+    ("activity ranges", lambda: [legacy_activity(r) for r in SAMPLE_RANGES],
+     lambda: [parse_time_range(r, "Unknown") for r in SAMPLE_RANGES]),
+    ("activity ranges, batch", lambda: [legacy_activity(r) for r in SAMPLE_RANGES],
+     lambda: parse_time_ranges(SAMPLE_RANGES, "Unknown")),
+]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--number", type=int, default=20000, help="calls per measurement")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="measurements per case; the best is kept")
+    args = arg_parser.parse_args()
+
+    print(f"{'case':<24} {'legacy us':>10} {'shared us':>10} {'speedup':>8}")
+    for name, legacy, shared in CASES:
+        legacy_time = min(timeit.repeat(legacy, number=args.number, repeat=args.repeat)) / args.number
+        shared_time = min(timeit.repeat(shared, number=args.number, repeat=args.repeat)) / args.number
+        print(f"{name:<24} {legacy_time * 1e6:>10.2f} {shared_time * 1e6:>10.2f} {legacy_time / shared_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import json
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from http_client import DEFAULT_SETTINGS as HTTP_SETTINGS
+from parsers import PARSERS
+
+VENUES_FILE = Path(os.getenv("VENUES_FILE", Path(__file__).parent / "venues.json"))
+
+REQUIRED_FIELDS = ("eircode", "url", "latitude", "longitude", "parser", "recipe")
+
+
+def compile_venue(definition: dict) -> dict:
+    """
+    Validate one venue definition and compile its recipe.
+
+    The returned dict is the definition with "recipe" replaced by what its
+    parser's compile() built: precompiled regexes, the SoupStrainer, defaults.
+    """
+    label = definition.get("eircode", "<no eircode>")
+    missing = [field for field in REQUIRED_FIELDS if field not in definition]
+    if missing:
+        raise ValueError(f"Venue {label}: missing {', '.join(missing)}")
+    if definition["parser"] not in PARSERS:
+        raise ValueError(f"Venue {label}: unknown parser {definition['parser']!r}")
+    if not isinstance(definition["latitude"], (int, float)) or not isinstance(definition["longitude"], (int, float)):
+        raise ValueError(f"Venue {label}: latitude and longitude must be numbers")
+    http = definition.get("http", {})
+    if not isinstance(http, dict):
+        raise ValueError(f"Venue {label}: http must be an object")
+    unknown = sorted(set(http) - set(HTTP_SETTINGS))
+    if unknown:
+        raise ValueError(
+            f"Venue {label}: unknown http settings {', '.join(unknown)}; expected some of {', '.join(HTTP_SETTINGS)}"
+        )
+
+    try:
+        recipe = PARSERS[definition["parser"]].compile(definition["recipe"])
+    except KeyError as e:
+        raise ValueError(f"Venue {label}: recipe is missing {e}") from e
+    except re.error as e:
+        raise ValueError(f"Venue {label}: bad pattern in recipe: {e}") from e
+
+    return {**definition, "eircode": definition["eircode"].lower(), "recipe": recipe}
+
+
+def load_venues(path: Path = VENUES_FILE) -> dict:
+    """Load and compile every venue in a definitions file, keyed by eircode."""
+    with open(path, 'r', encoding='utf-8') as f:
+        definitions = json.load(f)
+
+    venues = {}
+    for definition in definitions:
+        venue = compile_venue(definition)
+        if venue["eircode"] in venues:
+            raise ValueError(f"Venue {venue['eircode']} is defined twice in {path}")
+        venues[venue["eircode"]] = venue
+    return venues
+
+
+@lru_cache(maxsize=None)
+def get_venues() -> dict:
+    """The compiled venues from VENUES_FILE, loaded once per process."""
+    return load_venues()
@@ -0,0 +1,557 @@
+import asyncio
+import base64
+import binascii
+import hmac
+import ipaddress
+import json
+import logging
+import math
+import time
+from collections import deque
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+
+from .event_index import get_event_index, parse_datetime, parse_duration
+from .extraction import event_files, file_eircode, iter_file_events
+from .http_cache import versioned
+from .updates import UpdateStream
+
+logger = logging.getLogger(__name__)
+
+EVENT_FIELDS = (
+    'id', 'name', 'start_time', 'extracted_time', 'extracted_url', 'duration',
+    'recurrence', 'eircode', 'longitude', 'latitude',
+)
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 2000
+
+
+class BadRequest(ValueError):
+    """A query parameter that could not be understood."""
+
+
+def json_response(data, status=200):
+    """
+    Compact JSON response; separators without spaces keep payloads small.
+    """
+    return HttpResponse(
+        json.dumps(data, separators=(',', ':')),
+        content_type='application/json',
+        status=status,
+    )
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(',', ':')).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise BadRequest("Invalid cursor")
+    if not (isinstance(key, list) and len(key) == 3 and isinstance(key[0], (int, float))
+            and isinstance(key[1], str) and isinstance(key[2], str)):
+        raise BadRequest("Invalid cursor")
+    return key
+
+
+def parse_time_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise BadRequest(f"Invalid {name}: expected an ISO 8601 date or datetime")
+    return parsed.timestamp()
+
+
+def parse_bbox(value):
+    """
+    "min_lng,min_lat,max_lng,max_lat", the order of Leaflet's toBBoxString.
+    """
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(part) for part in value.split(','))
+    except ValueError:
+        raise BadRequest("Invalid bbox: expected min_lng,min_lat,max_lng,max_lat")
+    return min_lng, min_lat, max_lng, max_lat
+
+
+def parse_list(value):
+    return {part.strip().lower() for part in value.split(',') if part.strip()}
+
+
+def parse_fields(value):
+    if not value:
+        return None
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = set(fields) - set(EVENT_FIELDS)
+    if unknown:
+        raise BadRequest(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return fields
+
+
+def parse_limit(value):
+    if not value:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise BadRequest("Invalid limit")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def recurrence_values(event):
+    """
+    An event's recurrence as a set of lowercase values; the mass parser
+    emits a list of days, the others a single string.
+    """
+    recurrence = event.get('recurrence')
+    if isinstance(recurrence, list):
+        return {str(value).lower() for value in recurrence}
+    if recurrence is None:
+        return set()
+    return {str(recurrence).lower()}
+
+
+def event_filter(params, index):
+    """
+    A predicate for the non-time filters in params, or None if there are none.
+    """
+    checks = []
+    if params.get('bbox'):
+        bbox = parse_bbox(params['bbox'])
+        venues = {venue['eircode'] for venue in index.venues.within(bbox)}
+        checks.append(lambda event: event.get('eircode') in venues)
+    if params.get('eircode'):
+        eircodes = parse_list(params['eircode'])
+        checks.append(lambda event: str(event.get('eircode', '')).lower() in eircodes)
+    if params.get('recurrence'):
+        recurrences = parse_list(params['recurrence'])
+        checks.append(lambda event: not recurrences.isdisjoint(recurrence_values(event)))
+    if not checks:
+        return None
+    return lambda event: all(check(event) for check in checks)
+
+
+@versioned
+def events_api(request):
+    """
+    Events overlapping a time window, optionally filtered, one page at a time.
+
+    Query parameters:
+        start, end   ISO 8601 bounds; an event matches if it runs at any
+                     point in [start, end), using its duration
+        bbox         min_lng,min_lat,max_lng,max_lat
+        eircode      comma-separated eircodes
+        recurrence   comma-separated recurrence values, e.g. weekly,sunday
+        fields       comma-separated fields to return (default: all)
+        limit        page size, at most MAX_LIMIT
+        cursor       the "next" value from the previous page
+
+    Responds with {"version", "events", "next"}; next is null on the last page.
+    """
+    params = request.GET
+    index = get_event_index()
+    try:
+        start = parse_time_param(params, 'start')
+        end = parse_time_param(params, 'end')
+        matches = event_filter(params, index)
+        fields = parse_fields(params.get('fields'))
+        limit = parse_limit(params.get('limit'))
+        after = decode_cursor(params['cursor']) if params.get('cursor') else None
+    except BadRequest as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    page = []
+    next_cursor = None
+    for position in index.overlapping(start, end, after):
+        event = index.events[position]
+        if matches is not None and not matches(event):
+            continue
+        if len(page) == limit:
+            next_cursor = encode_cursor(index.keys[page[-1]])
+            break
+        page.append(position)
+
+    events = [index.events[position] for position in page]
+    if fields is not None:
+        events = [{field: event.get(field) for field in fields} for event in events]
+    return json_response({'version': index.version, 'events': events, 'next': next_cursor})
+
+
+STREAM_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+def stream_filter(params):
+    """
+    A predicate for the events_api filters in params, applied to events as
+    they are read, or None if there are none. bbox is checked against each
+    event's own coordinates, since streaming does not build the venue index.
+    """
+    checks = []
+    start = parse_time_param(params, 'start')
+    end = parse_time_param(params, 'end')
+    if start is not None or end is not None:
+        def overlaps(event):
+            event_start = parse_datetime(event.get('start_time'))
+            if event_start is None:
+                return False
+            event_end = event_start + parse_duration(event.get('duration'))
+            return ((end is None or event_start.timestamp() < end)
+                    and (start is None or event_end.timestamp() > start))
+        checks.append(overlaps)
+    if params.get('bbox'):
+        min_lng, min_lat, max_lng, max_lat = parse_bbox(params['bbox'])
+
+        def inside(event):
+            try:
+                lat, lng = float(event['latitude']), float(event['longitude'])
+            except (KeyError, TypeError, ValueError):
+                return False
+            return min_lat <= lat <= max_lat and min_lng <= lng <= max_lng
+        checks.append(inside)
+    if params.get('recurrence'):
+        recurrences = parse_list(params['recurrence'])
+        checks.append(lambda event: not recurrences.isdisjoint(recurrence_values(event)))
+    if not checks:
+        return None
+    return lambda event: all(check(event) for check in checks)
+
+
+def stream_paths(params):
+    """
+    The extraction files to stream, narrowed by the eircode param.
+    """
+    paths = event_files(settings.EXTRACTION_DIR)
+    if params.get('eircode'):
+        eircodes = parse_list(params['eircode'])
+        paths = [path for path in paths if file_eircode(path).lower() in eircodes]
+    return paths
+
+
+def file_chunk(path, matches, fields, separator):
+    """
+    One file's matching events, serialised and joined by separator, or ''
+    if none match.
+    """
+    lines = []
+    for event in iter_file_events(path):
+        if matches is not None and not matches(event):
+            continue
+        if fields is not None:
+            event = {field: event.get(field) for field in fields}
+        lines.append(json.dumps(event, separators=(',', ':')))
+    return separator.join(lines)
+
+
+def stream_chunks(paths, matches, fields, output_format):
+    """
+    The response body one file at a time, so the first venue is on its way
+    before the last is read and memory never holds more than one venue.
+    """
+    if output_format == 'json':
+        yield '['
+    first = True
+    for path in paths:
+        chunk = file_chunk(path, matches, fields, ',\n' if output_format == 'json' else '\n')
+        if not chunk:
+            continue
+        if output_format == 'json':
+            yield chunk if first else ',\n' + chunk
+        else:
+            yield chunk + '\n'
+        first = False
+    if output_format == 'json':
+        yield ']\n'
+
+
+async def astream_chunks(paths, matches, fields, output_format):
+    """
+    stream_chunks for ASGI servers; each file is read and serialised in a
+    worker thread so the event loop is never blocked on disk.
+    """
+    chunks = stream_chunks(paths, matches, fields, output_format)
+    done = object()
+    while True:
+        chunk = await sync_to_async(next, thread_sensitive=False)(chunks, done)
+        if chunk is done:
+            return
+        yield chunk
+
+
+async def events_stream_api(request):
+    """
+    Every event, streamed straight from the extraction files for consumers
+    pulling the full feed.
+
+    Takes the start, end, bbox, eircode, recurrence and fields parameters
+    of events_api, without pagination. format=ndjson (the default) sends one
+    event per line; format=json sends a single JSON array. Events come
+    venue by venue rather than in start time order.
+    """
+    params = request.GET
+    output_format = params.get('format') or 'ndjson'
+    try:
+        if output_format not in STREAM_CONTENT_TYPES:
+            raise BadRequest("Invalid format: expected ndjson or json")
+        matches = stream_filter(params)
+        fields = parse_fields(params.get('fields'))
+    except BadRequest as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    paths = await sync_to_async(stream_paths, thread_sensitive=False)(params)
+
+    # A WSGI server would buffer an async iterator whole before sending it,
+    # so it gets the plain generator instead
+    if isinstance(request, ASGIRequest):
+        body = astream_chunks(paths, matches, fields, output_format)
+    else:
+        body = stream_chunks(paths, matches, fields, output_format)
+    response = StreamingHttpResponse(body, content_type=STREAM_CONTENT_TYPES[output_format])
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def update_messages(stream):
+    while not stream.expired:
+        time.sleep(settings.EVENT_UPDATES_POLL_INTERVAL)
+        message = stream.poll()
+        if message:
+            yield message
+
+
+async def aupdate_messages(stream):
+    while not stream.expired:
+        await asyncio.sleep(settings.EVENT_UPDATES_POLL_INTERVAL)
+        message = await sync_to_async(stream.poll, thread_sensitive=False)()
+        if message:
+            yield message
+
+
+async def events_updates_api(request):
+    """
+    Server-sent events announcing each new data version, with the events
+    added, changed and removed since the version the client has.
+
+    The client's version comes from Last-Event-ID on a reconnect, or the
+    version parameter on the first connection. Connections close after
+    EVENT_UPDATES_MAX_SECONDS and the browser reconnects where it left off.
+    """
+    client_version = request.headers.get('Last-Event-ID') or request.GET.get('version') or None
+    stream = UpdateStream(client_version)
+    opening = await sync_to_async(stream.opening, thread_sensitive=False)()
+
+    # As with the stream API, WSGI servers get a plain generator; each
+    # connection then holds a server thread until it expires
+    if isinstance(request, ASGIRequest):
+        async def body():
+            yield opening
+            async for message in aupdate_messages(stream):
+                yield message
+    else:
+        def body():
+            yield opening
+            yield from update_messages(stream)
+    response = StreamingHttpResponse(body(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stops nginx buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def parse_float_param(params, name, low=None, high=None):
+    """
+    A required finite number, optionally within [low, high].
+    """
+    try:
+        value = float(params[name])
+    except KeyError:
+        raise BadRequest(f"Missing {name}")
+    except ValueError:
+        raise BadRequest(f"Invalid {name}")
+    if not math.isfinite(value):
+        raise BadRequest(f"Invalid {name}")
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise BadRequest(f"Invalid {name}: expected a value from {low} to {high}")
+    return value
+
+
+def parse_int_param(params, name, default):
+    if not params.get(name):
+        return default
+    try:
+        return int(params[name])
+    except ValueError:
+        raise BadRequest(f"Invalid {name}: expected an integer")
+
+
+@versioned
+def venues_api(request):
+    """
+    Venues in a map viewport, given as bbox=min_lng,min_lat,max_lng,max_lat,
+    or every venue without one.
+    """
+    index = get_event_index()
+    if not request.GET.get('bbox'):
+        return json_response({'version': index.version, 'venues': index.venues.venues})
+    try:
+        bbox = parse_bbox(request.GET['bbox'])
+    except BadRequest as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return json_response({'version': index.version, 'venues': index.venues.within(bbox)})
+
+
+@versioned
+def nearest_venues_api(request):
+    """
+    The k (default 5, at most 50) venues nearest lat/lng, closest first,
+    each with its distance in metres.
+    """
+    try:
+        lat = parse_float_param(request.GET, 'lat', -90, 90)
+        lng = parse_float_param(request.GET, 'lng', -180, 180)
+        k = parse_int_param(request.GET, 'k', 5)
+    except BadRequest as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    k = max(1, min(k, 50))
+
+    index = get_event_index()
+    venues = [dict(venue, distance_m=round(distance)) for distance, venue in index.venues.nearest(lat, lng, k)]
+    return json_response({'version': index.version, 'venues': venues})
+
+
+def venue_scope(params, index):
+    """
+    The eircodes selected by the bbox and eircode params, or None for all.
+    """
+    scope = None
+    if params.get('bbox'):
+        scope = {venue['eircode'] for venue in index.venues.within(parse_bbox(params['bbox']))}
+    if params.get('eircode'):
+        eircodes = parse_list(params['eircode'])
+        selected = {eircode for eircode in index.venue_starts if str(eircode).lower() in eircodes}
+        scope = selected if scope is None else scope & selected
+    return scope
+
+
+def group_by_venue(index, positions):
+    """
+    Events at positions as [{eircode, latitude, longitude, events}], one
+    entry per venue, ready to become map markers.
+    """
+    venues = {}
+    for position in positions:
+        event = index.events[position]
+        eircode = event.get('eircode')
+        if eircode not in venues:
+            venues[eircode] = {
+                'eircode': eircode,
+                'latitude': event.get('latitude'),
+                'longitude': event.get('longitude'),
+                'events': [],
+            }
+        venues[eircode]['events'].append(event)
+    return list(venues.values())
+
+
+def active_events_api(request):
+    """
+    Events running at the ISO 8601 time at (default now), grouped by venue.
+    Takes the bbox and eircode filters of events_api.
+    """
+    index = get_event_index()
+    try:
+        at = parse_time_param(request.GET, 'at') or time.time()
+        scope = venue_scope(request.GET, index)
+    except BadRequest as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    positions = index.active_at(at)
+    if scope is not None:
+        positions = [position for position in positions if index.events[position].get('eircode') in scope]
+    return json_response({'version': index.version, 'venues': group_by_venue(index, positions)})
+
+
+def next_events_api(request):
+    """
+    Each venue's first event starting after the ISO 8601 time after (default
+    now), grouped by venue. Takes the bbox and eircode filters of events_api.
+    """
+    index = get_event_index()
+    try:
+        after = parse_time_param(request.GET, 'after') or time.time()
+        scope = venue_scope(request.GET, index)
+    except BadRequest as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    positions = sorted(index.next_per_venue(after, scope).values())
+    return json_response({'version': index.version, 'venues': group_by_venue(index, positions)})
+
+
+def metrics_access(view):
+    """
+    Limit a view to internal callers: a request made straight to Django from
+    a loopback or private address (Prometheus inside the compose network),
+    or any request carrying "Authorization: Bearer <METRICS_TOKEN>". Requests
+    through nginx carry X-Forwarded-For, so they need the token.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = settings.METRICS_TOKEN
+        authorization = request.headers.get('Authorization', '')
+        if token and hmac.compare_digest(authorization.encode('utf-8'), f"Bearer {token}".encode('utf-8')):
+            return view(request, *args, **kwargs)
+        try:
+            internal = ipaddress.ip_address(request.META.get('REMOTE_ADDR', '')).is_private
+        except ValueError:
+            internal = False
+        if internal and 'X-Forwarded-For' not in request.headers:
+            return view(request, *args, **kwargs)
+        return HttpResponseForbidden("Metrics are only available internally")
+
+    return wrapper
+
+
+@metrics_access
+def metrics_view(request):
+    """
+    The extractor's per-venue metrics in Prometheus text format.
+    """
+    try:
+        body = (settings.METRICS_DIR / 'extraction.prom').read_bytes()
+    except FileNotFoundError:
+        body = b''
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@metrics_access
+def metrics_api(request):
+    """
+    Each venue's latest extraction metrics, plus the last N (at most 1000)
+    records from the run log when runs=N is given.
+    """
+    try:
+        latest = json.loads((settings.METRICS_DIR / 'latest.json').read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        latest = {}
+    data = {'venues': latest}
+
+    if request.GET.get('runs'):
+        try:
+            runs = max(1, min(int(request.GET['runs']), 1000))
+        except ValueError:
+            return JsonResponse({'error': "Invalid runs"}, status=400)
+        try:
+            with open(settings.METRICS_DIR / 'runs.jsonl', 'r', encoding='utf-8') as f:
+                lines = deque(f, maxlen=runs)
+        except FileNotFoundError:
+            lines = []
+        data['runs'] = [json.loads(line) for line in lines if line.strip()]
+    return json_response(data)
@@ -0,0 +1,220 @@
+import hashlib
+import http.client
+import json
+import math
+import random
+import string
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Around the default map view, so venues land on screen
+CENTRE = (53.3774, -6.3788)
+SPREAD_DEGREES = 0.15
+EVENT_NAMES = ("Sunday Mass", "Vigil Mass", "Weekday Mass", "Adoration", "Confessions", "Rosary")
+DAYS = ("MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY")
+WEEKS = 8
+
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def synthetic_event_id(event):
+    identity = [event["eircode"], event["name"], event["start_time"], event["recurrence"]]
+    return hashlib.sha256(json.dumps(identity, separators=(',', ':')).encode('utf-8')).hexdigest()[:16]
+
+
+def generate_corpus(output_dir, venues, events_per_venue, seed=0, write_index=True, now=None):
+    """
+    Write a synthetic extraction directory: one <eircode>.json per venue in
+    the extractor's schema, with each weekly event expanded over WEEKS
+    weeks, plus the consolidated index.json unless write_index is False.
+    The same seed gives the same venues and times, relative to the current
+    week.
+
+    Returns the number of events written.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    now = (now or datetime.now(timezone.utc)).replace(minute=0, second=0, microsecond=0)
+    monday = (now - timedelta(days=now.weekday())).replace(hour=0)
+    extracted = now.strftime(TIME_FORMAT)
+
+    all_events = []
+    venue_meta = {}
+    for v in range(venues):
+        eircode = 'x' + ''.join(rng.choices(string.ascii_lowercase + string.digits, k=6))
+        latitude = CENTRE[0] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES)
+        longitude = CENTRE[1] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES)
+        url = f"https://venue{v}.example.com/times"
+        events = []
+        weekly = math.ceil(events_per_venue / WEEKS)
+        for _ in range(weekly):
+            day = rng.randrange(7)
+            hour, minute = rng.randrange(7, 21), rng.choice((0, 15, 30))
+            name = rng.choice(EVENT_NAMES)
+            for week in range(WEEKS):
+                if len(events) == events_per_venue:
+                    break
+                start = monday + timedelta(weeks=week, days=day, hours=hour, minutes=minute)
+                event = {
+                    "name": name,
+                    "start_time": start.strftime(TIME_FORMAT),
+                    "extracted_time": extracted,
+                    "extracted_url": url,
+                    "duration": rng.choice(("PT30M", "PT45M", "PT1H0M")),
+                    "recurrence": [DAYS[day]],
+                    "eircode": eircode,
+                    "longitude": longitude,
+                    "latitude": latitude,
+                }
+                event["id"] = synthetic_event_id(event)
+                events.append(event)
+        (output_dir / f"{eircode}.json").write_text(json.dumps(events, indent=2), encoding='utf-8')
+        all_events.extend(events)
+        venue_meta[eircode] = {
+            "name": f"Venue {v}", "url": url, "latitude": latitude, "longitude": longitude,
+            "parser": "synthetic", "events": len(events),
+        }
+
+    if write_index:
+        all_events.sort(key=lambda e: (e["start_time"], e["eircode"], e["name"]))
+        payload = json.dumps([all_events, venue_meta], sort_keys=True, separators=(',', ':')).encode('utf-8')
+        index = {
+            "version": hashlib.sha256(payload).hexdigest()[:16],
+            "generated": extracted,
+            "venues": venue_meta,
+            "next": {},
+            "events": all_events,
+        }
+        (output_dir / "index.json").write_text(json.dumps(index, separators=(',', ':')), encoding='utf-8')
+    return len(all_events)
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list, or None if empty."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def read_rss_kb(pid):
+    """
+    (current, peak) resident set size of a process in KiB from /proc, or
+    (None, None) where that is unavailable.
+    """
+    try:
+        with open(f"/proc/{pid}/status", encoding='ascii') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+    except OSError:
+        return None, None
+    rss = fields.get('VmRSS', '').split()
+    peak = fields.get('VmHWM', '').split()
+    return (int(rss[0]) if rss else None, int(peak[0]) if peak else None)
+
+
+def fetch(base_url, path, headers, timeout=60):
+    """
+    GET base_url + path on a fresh connection, reading the whole body.
+    Returns (status, body bytes).
+    """
+    parts = urlsplit(base_url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    connection = connection_class(parts.netloc, timeout=timeout)
+    try:
+        connection.request('GET', parts.path.rstrip('/') + path, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def load_endpoint(base_url, path, requests, concurrency, headers=None):
+    """
+    Send requests GETs for path from concurrency threads and summarise:
+    requests, errors, rps, p50_ms, p99_ms, mean_ms and bytes (the body
+    size as received, i.e. compressed when the server compressed it).
+    """
+    headers = headers or {}
+    latencies = []
+    sizes = []
+    errors = 0
+    remaining = [requests]
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal errors
+        while True:
+            with lock:
+                if remaining[0] == 0:
+                    return
+                remaining[0] -= 1
+            started = time.perf_counter()
+            try:
+                status, body = fetch(base_url, path, headers)
+            except (OSError, http.client.HTTPException):
+                status, body = None, b''
+            elapsed = time.perf_counter() - started
+            with lock:
+                if status != 200:
+                    errors += 1
+                else:
+                    latencies.append(elapsed)
+                    sizes.append(len(body))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(len(latencies) / wall, 1) if wall else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+        "bytes": max(sizes) if sizes else None,
+    }
+
+
+def default_endpoints(now=None):
+    """
+    {name: path} for the public pages and data endpoints, with a
+    week-long calendar range starting now.
+    """
+    now = now or datetime.now(timezone.utc)
+    start = now.strftime('%Y-%m-%dT00:00:00Z')
+    end = (now + timedelta(days=7)).strftime('%Y-%m-%dT00:00:00Z')
+    lat, lng = CENTRE
+    return {
+        "events_view": "/",
+        "events_api_week": f"/api/events?start={start}&end={end}&fields=id,name,start_time,duration,eircode,longitude,latitude,extracted_url",
+        "events_now": "/api/events/now",
+        "events_next": "/api/events/next",
+        "venues": "/api/venues",
+        "venues_nearest": f"/api/venues/nearest?lat={lat}&lng={lng}&k=10",
+        "events_stream": "/api/events/stream",
+    }
+
+
+def load_results(results_path):
+    try:
+        with open(results_path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def append_result(results_path, result):
+    results_path = Path(results_path)
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(results_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(result, separators=(',', ':')) + '\n')
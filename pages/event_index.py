@@ -0,0 +1,138 @@
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+
+from .extraction import get_event_cache
+from .spatial import VenueIndex
+
+DURATION_RE = re.compile(r'^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+DEFAULT_DURATION = timedelta(hours=1)
+
+
+def parse_duration(value):
+    """
+    Parse an ISO 8601 duration such as "PT1H30M". Missing or unknown
+    durations (the parsers emit "Unknown") count as one hour.
+    """
+    match = DURATION_RE.match(value or '')
+    if not match or not any(match.groups()):
+        return DEFAULT_DURATION
+    days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return timedelta(days=days, hours=hours, minutes=minutes, seconds=seconds)
+
+
+def parse_datetime(value):
+    """
+    Parse an ISO 8601 date or datetime, treating naive values as UTC.
+    Returns None for anything unparseable.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class EventIndex:
+    """
+    The events of one cache version, sorted by start time.
+
+    Every event has a sort key of (start timestamp, eircode, name), which
+    doubles as the pagination cursor, so pages stay stable across versions.
+    Events without a parseable start time are left out. venues is a
+    spatial index over the venues the events come from.
+    """
+
+    def __init__(self, events, version, modified=None):
+        self.version = version
+        self.modified = modified
+        rows = []
+        for event in events:
+            start = parse_datetime(event.get('start_time'))
+            if start is None:
+                continue
+            end = start + parse_duration(event.get('duration'))
+            key = (start.timestamp(), event.get('eircode') or '', event.get('name') or '')
+            rows.append((key, end.timestamp(), event))
+        rows.sort(key=lambda row: row[0])
+
+        self.keys = [row[0] for row in rows]
+        self.starts = [row[0][0] for row in rows]
+        self.ends = [row[1] for row in rows]
+        self.events = [row[2] for row in rows]
+        self.max_duration = max((end - key[0] for key, end, _ in rows), default=0)
+        self.venues = VenueIndex.from_events(self.events)
+
+        # Each venue's event positions and start times, both in start order
+        self.venue_positions = {}
+        self.venue_starts = {}
+        for position, event in enumerate(self.events):
+            eircode = event.get('eircode')
+            self.venue_positions.setdefault(eircode, []).append(position)
+            self.venue_starts.setdefault(eircode, []).append(self.starts[position])
+
+    def __len__(self):
+        return len(self.events)
+
+    def overlapping(self, start=None, end=None, after=None):
+        """
+        Yield positions of events overlapping [start, end), in sort order.
+
+        start and end are timestamps; either may be None for an open end.
+        after is a sort key; only events sorting after it are yielded.
+        """
+        lo = 0
+        if start is not None:
+            # Nothing starting earlier than the longest event can still be running
+            lo = bisect_right(self.starts, start - self.max_duration)
+        if after is not None:
+            lo = max(lo, bisect_right(self.keys, tuple(after)))
+        hi = len(self.starts) if end is None else bisect_left(self.starts, end)
+        for position in range(lo, hi):
+            if start is None or self.ends[position] > start:
+                yield position
+
+    def active_at(self, at):
+        """
+        Positions of events running at timestamp at, i.e. start <= at <= end.
+        """
+        # Only events starting within max_duration before at can still be running
+        lo = bisect_left(self.starts, at - self.max_duration)
+        hi = bisect_right(self.starts, at)
+        return [position for position in range(lo, hi) if self.ends[position] >= at]
+
+    def next_per_venue(self, after, eircodes=None):
+        """
+        {eircode: position} of each venue's first event starting after
+        timestamp after, for the given eircodes or every venue.
+        """
+        found = {}
+        for eircode in self.venue_starts if eircodes is None else eircodes:
+            starts = self.venue_starts.get(eircode)
+            if not starts:
+                continue
+            i = bisect_right(starts, after)
+            if i < len(starts):
+                found[eircode] = self.venue_positions[eircode][i]
+        return found
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_event_index():
+    """
+    The EventIndex for the event cache's current version, rebuilt on change.
+    """
+    global _index
+    cache = get_event_cache()
+    snapshot = cache.snapshot
+    if _index is None or _index.version != snapshot['version']:
+        with _index_lock:
+            if _index is None or _index.version != snapshot['version']:
+                _index = EventIndex(snapshot['events'], snapshot['version'], snapshot['modified'])
+    return _index
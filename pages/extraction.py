@@ -0,0 +1,225 @@
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Extraction output formats: JSON arrays (indented or minified), gzipped
+# JSON arrays and newline-delimited JSON events
+EVENT_FILE_PATTERNS = ('*.json', '*.json.gz', '*.ndjson')
+# Consolidated index the extractor writes after each run, holding every
+# venue's events already merged and sorted
+INDEX_FILE = 'index.json'
+
+
+def event_files(extraction_dir):
+    """
+    All per-venue extraction output files in a directory.
+    """
+    return sorted(
+        f for pattern in EVENT_FILE_PATTERNS for f in Path(extraction_dir).glob(pattern)
+        if f.name != INDEX_FILE
+    )
+
+
+def file_eircode(path):
+    """
+    The eircode an extraction output file belongs to, e.g. d15ca4v.json.gz -> d15ca4v.
+    """
+    name = Path(path).name
+    for suffix in ('.json.gz', '.ndjson', '.json'):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return Path(path).stem
+
+
+def iter_file_events(file_path):
+    """
+    Yields the events of one extraction output file. Newline-delimited
+    files are read a line at a time; JSON arrays are read whole, so at most
+    one venue's events are held at once.
+    """
+    file_path = Path(file_path)
+    if file_path.suffix != '.ndjson':
+        yield from load_json_file(file_path) or []
+        return
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    except FileNotFoundError:
+        logger.error(f"File not found: {file_path}")
+    except (json.JSONDecodeError, OSError) as e:
+        logger.error(f"Error decoding JSON from {file_path}: {e}")
+
+
+def load_json_file(file_path):
+    """
+    Loads event data from an extraction output file in any of its formats.
+    """
+    file_path = Path(file_path)
+    try:
+        if file_path.name.endswith('.json.gz'):
+            with gzip.open(file_path, 'rt', encoding='utf-8') as file:
+                data = json.load(file)
+        elif file_path.suffix == '.ndjson':
+            with open(file_path, 'r', encoding='utf-8') as file:
+                data = [json.loads(line) for line in file if line.strip()]
+        else:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        logger.info(f"Successfully loaded data from {file_path}")
+        return data
+    except FileNotFoundError:
+        logger.error(f"File not found: {file_path}")
+    except (json.JSONDecodeError, OSError, EOFError) as e:
+        logger.error(f"Error decoding JSON from {file_path}: {e}")
+    return None
+
+
+class EventCache:
+    """
+    Process-wide cache of the combined events from an extraction directory.
+
+    When the extractor's consolidated index exists it is the only file read,
+    reloaded when its mtime or size changes, with no globbing or merging.
+    Otherwise each per-venue output file is kept with the (mtime, size) it
+    was read at and its events. A refresh stats at most once per
+    check_interval seconds and re-reads only what changed, so a request
+    between changes costs a clock check and a few attribute reads.
+    """
+
+    def __init__(self, extraction_dir, check_interval=5.0):
+        self.extraction_dir = Path(extraction_dir)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._files = {}
+        self._checked_at = None
+        # Replaced as a whole so readers never mix two versions
+        self._snapshot = {
+            'version': hashlib.sha256(b'').hexdigest()[:16],
+            'modified': None,
+            'events': [],
+        }
+
+    @property
+    def snapshot(self):
+        """
+        The current version, modified time and events, read together.
+        """
+        return self._snapshot
+
+    @property
+    def version(self):
+        """
+        Short hash identifying the current set of files and their stats.
+        """
+        return self._snapshot['version']
+
+    @property
+    def events(self):
+        return self._snapshot['events']
+
+    def _stat_files(self):
+        stats = {}
+        for path in event_files(self.extraction_dir):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Replaced or removed since the glob
+            stats[path] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def _refresh_from_index(self):
+        """
+        Load the consolidated index if it exists and changed. Returns False
+        when there is no usable index, to fall back to the per-venue files.
+        """
+        path = self.extraction_dir / INDEX_FILE
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return False
+        stat = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached and cached['stat'] == stat and len(self._files) == 1:
+            return True
+
+        index = load_json_file(path)
+        if not isinstance(index, dict) or 'events' not in index:
+            logger.error(f"Ignoring malformed index {path.name}")
+            return False
+        self._files = {path: {'stat': stat}}
+        self._snapshot = {
+            'version': index.get('version') or hashlib.sha256(repr(stat).encode('utf-8')).hexdigest()[:16],
+            'modified': stat[0] / 1e9,
+            'events': index['events'],
+        }
+        logger.info(f"Event cache now holds {len(index['events'])} events from {path.name}")
+        return True
+
+    def refresh(self, force=False):
+        """
+        Bring the cache up to date with the extraction directory.
+        """
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+
+            if self._refresh_from_index():
+                return
+
+            stats = self._stat_files()
+            if stats == {path: entry['stat'] for path, entry in self._files.items()}:
+                return
+
+            files = {}
+            for path, stat in stats.items():
+                cached = self._files.get(path)
+                if cached and cached['stat'] == stat:
+                    files[path] = cached
+                    continue
+                events = load_json_file(path) or []
+                files[path] = {
+                    'stat': stat,
+                    'events': events,
+                }
+                logger.info(f"Cached {len(events)} events from {path.name}")
+
+            self._files = files
+            signature = repr(sorted((str(path), entry['stat']) for path, entry in files.items()))
+            self._snapshot = {
+                'version': hashlib.sha256(signature.encode('utf-8')).hexdigest()[:16],
+                # Newest file mtime in seconds, for Last-Modified
+                'modified': max((entry['stat'][0] for entry in files.values()), default=0) / 1e9 or None,
+                'events': [event for entry in files.values() for event in entry['events']],
+            }
+            logger.info(f"Event cache now holds {len(self.events)} events from {len(files)} files")
+
+
+_event_cache = None
+_event_cache_lock = threading.Lock()
+
+
+def get_event_cache():
+    """
+    The process-wide EventCache for settings.EXTRACTION_DIR, refreshed if due.
+    """
+    global _event_cache
+    if _event_cache is None:
+        with _event_cache_lock:
+            if _event_cache is None:
+                _event_cache = EventCache(settings.EXTRACTION_DIR, settings.EVENT_CACHE_CHECK_INTERVAL)
+    _event_cache.refresh()
+    return _event_cache
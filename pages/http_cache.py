@@ -0,0 +1,148 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+from .event_index import get_event_index
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip is always available
+    brotli = None
+
+# Smaller bodies are sent as-is; compression would barely shrink them
+MIN_COMPRESS_BYTES = 512
+
+
+class CompressedBodies:
+    """
+    LRU of compressed response bodies keyed by their ETag.
+
+    ETags embed the data version, so each body is compressed once per
+    version and entries for old versions simply age out.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._bodies = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, body, encoding):
+        with self._lock:
+            if key in self._bodies:
+                self._bodies.move_to_end(key)
+                return self._bodies[key]
+        if encoding == 'br':
+            compressed = brotli.compress(body)
+        else:
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        with self._lock:
+            self._bodies[key] = compressed
+            while len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+        return compressed
+
+
+_bodies = None
+
+
+def _compressed_bodies():
+    global _bodies
+    if _bodies is None:
+        _bodies = CompressedBodies(settings.COMPRESSED_CACHE_ENTRIES)
+    return _bodies
+
+
+def accepted_encoding(request):
+    """
+    The best encoding the client accepts: br (when brotli is installed),
+    then gzip, then identity.
+    """
+    accepted = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(coding.strip().lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return 'identity'
+
+
+def _etag(version, request, encoding):
+    """
+    Strong ETag for one representation: the data version and full URL,
+    plus the encoding, since each encoding is a different byte sequence.
+    """
+    digest = hashlib.sha256(f"{version}:{request.get_full_path()}".encode('utf-8')).hexdigest()[:20]
+    return f'"{digest}"' if encoding == 'identity' else f'"{digest}-{encoding}"'
+
+
+def _set_validators(response, etag, index):
+    response['ETag'] = etag
+    if index.modified:
+        response['Last-Modified'] = http_date(index.modified)
+    response['Cache-Control'] = f"public, max-age={settings.EVENT_DATA_MAX_AGE}"
+    patch_vary_headers(response, ('Accept-Encoding',))
+
+
+def versioned(view):
+    """
+    Conditional GETs and compression for views whose output depends only on
+    the event data version and the request URL.
+
+    A matching If-None-Match (or, without one, an If-Modified-Since no older
+    than the data) gets a 304 before the view runs. Otherwise the body is
+    compressed for the client, once per version, and sent with an ETag,
+    Last-Modified and Cache-Control.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        index = get_event_index()
+        encoding = accepted_encoding(request)
+        encoded_etag = _etag(index.version, request, encoding)
+        identity_etag = _etag(index.version, request, 'identity')
+
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            # Small bodies go out uncompressed, so the client may hold either
+            matched = next((etag for etag in (encoded_etag, identity_etag) if etag in etags), None)
+            if matched is None and '*' in etags:
+                matched = encoded_etag
+        else:
+            since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+            fresh = since is not None and index.modified is not None and int(index.modified) <= since
+            matched = encoded_etag if fresh else None
+        if matched:
+            response = HttpResponseNotModified()
+            _set_validators(response, matched, index)
+            return response
+
+        response = view(request, *args, **kwargs)
+        if response.status_code != 200 or response.streaming:
+            return response
+        # The data may have been reloaded while the view ran; only label
+        # the body with a version it is known to come from
+        if get_event_index().version != index.version:
+            return response
+
+        body = response.content
+        etag = identity_etag
+        if encoding != 'identity' and len(body) >= MIN_COMPRESS_BYTES:
+            response.content = _compressed_bodies().get(encoded_etag, body, encoding)
+            response['Content-Encoding'] = encoding
+            etag = encoded_etag
+        response['Content-Length'] = str(len(response.content))
+        _set_validators(response, etag, index)
+        return response
+
+    return wrapper
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pages.benchmark import generate_corpus
+
+
+class Command(BaseCommand):
+    help = (
+        "Write a synthetic extraction directory of the given size, in the "
+        "extractor's output schema, for benchmarking."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dir', type=Path, help="Directory to write; should not be the real extraction output")
+        parser.add_argument('--venues', type=int, default=100)
+        parser.add_argument('--events', type=int, default=40, help="Events per venue")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--no-index', action='store_true',
+                            help="Only write the per-venue files, not index.json")
+
+    def handle(self, *args, **options):
+        if options['venues'] < 1 or options['events'] < 1:
+            raise CommandError("--venues and --events must be at least 1")
+        count = generate_corpus(
+            options['dir'], options['venues'], options['events'],
+            seed=options['seed'], write_index=not options['no_index'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {count} events for {options['venues']} venues to {options['dir']}"
+        ))
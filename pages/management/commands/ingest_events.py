@@ -0,0 +1,109 @@
+import hashlib
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from pages.event_index import parse_datetime, parse_duration
+from pages.extraction import event_files, file_eircode, load_json_file
+from pages.models import Event, Venue
+
+logger = logging.getLogger(__name__)
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_event(venue, data):
+    """
+    An unsaved Event from one extracted event, or None if it has no usable
+    start time.
+    """
+    start = parse_datetime(data.get('start_time'))
+    if start is None:
+        return None
+    return Event(
+        venue=venue,
+        eircode=venue.eircode,
+        name=(data.get('name') or '')[:255],
+        start_time=start,
+        end_time=start + parse_duration(data.get('duration')),
+        duration=data.get('duration') or '',
+        recurrence=data.get('recurrence'),
+        extracted_time=parse_datetime(data.get('extracted_time')),
+        extracted_url=data.get('extracted_url') or '',
+        latitude=data.get('latitude'),
+        longitude=data.get('longitude'),
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Load extraction output into the Venue and Event tables. Only venues "
+        "whose file changed since the last ingest are rewritten."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', type=Path, default=settings.EXTRACTION_DIR,
+                            help="Extraction directory (default: settings.EXTRACTION_DIR)")
+        parser.add_argument('--force', action='store_true',
+                            help="Re-ingest every venue, changed or not")
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help="Rows per bulk insert")
+
+    def handle(self, *args, **options):
+        files = {file_eircode(path): path for path in event_files(options['dir'])}
+        hashes = dict(Venue.objects.values_list('eircode', 'content_hash'))
+
+        ingested = skipped = 0
+        for eircode, path in sorted(files.items()):
+            try:
+                content_hash = file_hash(path)
+            except FileNotFoundError:
+                continue  # Replaced or removed since the glob
+            if not options['force'] and hashes.get(eircode) == content_hash:
+                skipped += 1
+                continue
+            events = load_json_file(path)
+            if events is None:
+                logger.warning(f"Keeping the previous rows for {eircode}; {path.name} could not be read")
+                continue
+            count = self.ingest_venue(eircode, content_hash, events, options['batch_size'])
+            ingested += 1
+            logger.info(f"Ingested {count} events for {eircode}")
+
+        # Venues whose file is gone take their events with them
+        vanished = Venue.objects.exclude(eircode__in=files)
+        removed = vanished.count()
+        vanished.delete()
+        self.stdout.write(self.style.SUCCESS(
+            f"Ingested {ingested} venues, skipped {skipped} unchanged, removed {removed}"
+        ))
+
+    @staticmethod
+    def ingest_venue(eircode, content_hash, events, batch_size):
+        """
+        Replace one venue's rows with events in a single transaction.
+        """
+        located = next((e for e in events if e.get('latitude') is not None), {})
+        with transaction.atomic():
+            Venue.objects.bulk_create(
+                [Venue(
+                    eircode=eircode,
+                    latitude=located.get('latitude'),
+                    longitude=located.get('longitude'),
+                    content_hash=content_hash,
+                )],
+                update_conflicts=True,
+                unique_fields=['eircode'],
+                update_fields=['latitude', 'longitude', 'content_hash', 'ingested_at'],
+            )
+            venue = Venue.objects.get(eircode=eircode)
+            Event.objects.filter(venue=venue).delete()
+            rows = [event for event in (build_event(venue, data) for data in events) if event is not None]
+            Event.objects.bulk_create(rows, batch_size=batch_size)
+        return len(rows)
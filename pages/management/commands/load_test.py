@@ -0,0 +1,172 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from pages.benchmark import (
+    append_result, default_endpoints, fetch, generate_corpus, load_endpoint, load_results, read_rss_kb,
+)
+
+# Metrics compared against the previous run, and whether higher is better
+COMPARED = (("rps", True), ("p50_ms", False), ("p99_ms", False), ("bytes", False), ("rss_kb", False))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            fetch(base_url, '/api/venues', {}, timeout=5)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"Server at {base_url} did not come up within {timeout}s")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return os.getenv('COMMIT_ID')
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the web tier: measure requests/sec, p50/p99 latency, response "
+        "size and server RSS per endpoint against a synthetic dataset, and "
+        "compare with the previous run of the same size."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--venues', type=int, default=100,
+                            help="Venues in the generated dataset (ignored with --dir or --url)")
+        parser.add_argument('--events', type=int, default=40,
+                            help="Events per venue in the generated dataset")
+        parser.add_argument('--dir', type=Path,
+                            help="Serve an existing extraction directory instead of generating one")
+        parser.add_argument('--url', help="Test an already running server instead of starting runserver")
+        parser.add_argument('--pid', type=int, help="Process ID of the --url server, for RSS")
+        parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint")
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--endpoint', action='append', default=[],
+                            help="Only these endpoints, by name (repeatable)")
+        parser.add_argument('--gzip', action='store_true', help="Send Accept-Encoding: gzip")
+        parser.add_argument('--results', type=Path, default=settings.BENCHMARK_RESULTS,
+                            help="JSON-lines file results are appended to")
+        parser.add_argument('--label', default='', help="Free-text note stored with the result")
+
+    def handle(self, *args, **options):
+        endpoints = default_endpoints()
+        unknown = set(options['endpoint']) - set(endpoints)
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}; known: {', '.join(endpoints)}")
+        if options['endpoint']:
+            endpoints = {name: path for name, path in endpoints.items() if name in options['endpoint']}
+
+        with tempfile.TemporaryDirectory(prefix='load-test-') as tmp:
+            dataset = {'venues': None, 'events': None, 'dir': None}
+            server = None
+            if options['url']:
+                base_url, pid = options['url'].rstrip('/'), options['pid']
+            else:
+                data_dir = options['dir']
+                if data_dir is None:
+                    data_dir = Path(tmp) / 'extraction'
+                    count = generate_corpus(data_dir, options['venues'], options['events'])
+                    dataset = {'venues': options['venues'], 'events': count, 'dir': None}
+                else:
+                    dataset['dir'] = str(data_dir)
+                port = free_port()
+                # A name in ALLOWED_HOSTS
+                base_url = f"http://localhost:{port}"
+                env = dict(os.environ, EXTRACTION_DIR=str(data_dir))
+                server = subprocess.Popen(
+                    [sys.executable, 'manage.py', 'runserver', '--noreload', f"127.0.0.1:{port}"],
+                    cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                )
+                pid = server.pid
+            try:
+                wait_until_up(base_url)
+                results = self.run(base_url, pid, endpoints, options)
+            finally:
+                if server is not None:
+                    server.terminate()
+                    server.wait()
+
+        result = {
+            'run': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'commit': git_commit(),
+            'label': options['label'],
+            'dataset': dataset,
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'gzip': options['gzip'],
+            'endpoints': results,
+        }
+        previous = self.previous_result(options['results'], result)
+        append_result(options['results'], result)
+        self.report(result, previous)
+        self.stdout.write(self.style.SUCCESS(f"Results appended to {options['results']}"))
+
+    def run(self, base_url, pid, endpoints, options):
+        headers = {'Accept-Encoding': 'gzip'} if options['gzip'] else {}
+        results = {}
+        for name, path in endpoints.items():
+            # One untimed request so lazy loading and caches are warm
+            fetch(base_url, path, headers)
+            stats = load_endpoint(base_url, path, options['requests'], options['concurrency'], headers)
+            stats['rss_kb'], stats['peak_rss_kb'] = read_rss_kb(pid) if pid else (None, None)
+            results[name] = stats
+        return results
+
+    @staticmethod
+    def previous_result(results_path, result):
+        """
+        The latest stored run with the same dataset, load and encoding.
+        """
+        same = ('dataset', 'requests', 'concurrency', 'gzip')
+        for candidate in reversed(load_results(results_path)):
+            if all(candidate.get(key) == result[key] for key in same):
+                return candidate
+        return None
+
+    def report(self, result, previous):
+        dataset = result['dataset']
+        if dataset['venues']:
+            self.stdout.write(f"{dataset['venues']} venues, {dataset['events']} events")
+        header = f"{'endpoint':<18}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'bytes':>12}{'rss KiB':>10}{'errors':>8}"
+        self.stdout.write(header)
+        for name, stats in result['endpoints'].items():
+            self.stdout.write(
+                f"{name:<18}{stats['rps'] or '-':>10}{stats['p50_ms'] or '-':>10}{stats['p99_ms'] or '-':>10}"
+                f"{stats['bytes'] or '-':>12}{stats['rss_kb'] or '-':>10}{stats['errors']:>8}"
+            )
+            before = (previous or {}).get('endpoints', {}).get(name)
+            if not before:
+                continue
+            changes = []
+            for key, higher_is_better in COMPARED:
+                old, new = before.get(key), stats.get(key)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old * 100
+                if abs(change) >= 5:
+                    better = (change > 0) == higher_is_better
+                    changes.append(f"{key} {change:+.0f}% ({'better' if better else 'worse'})")
+            if changes:
+                self.stdout.write(f"  vs {previous['commit'] or previous['run']}: {', '.join(changes)}")
@@ -0,0 +1,48 @@
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from pages.publish import publish
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the events page and per-day event data as static, precompressed "
+        "files for nginx to serve, and switch to them atomically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', type=Path, default=settings.PUBLISH_DIR,
+                            help="Publish directory (default: settings.PUBLISH_DIR)")
+        parser.add_argument('--keep', type=int, default=settings.PUBLISH_KEEP_RELEASES,
+                            help="Releases to keep on disk for pages still open on them")
+        parser.add_argument('--force', action='store_true',
+                            help="Rebuild even if the data version is already published")
+        parser.add_argument('--watch', action='store_true',
+                            help="Keep running, publishing each time the extraction output changes")
+
+    def handle(self, *args, **options):
+        keep = max(1, options['keep'])
+        version = publish(options['dir'], keep=keep, force=options['force'])
+        self.report(version)
+        if not options['watch']:
+            return
+
+        # The event cache stats the extraction directory at most once per
+        # check interval, so polling at that rate costs next to nothing
+        interval = max(1.0, settings.EVENT_CACHE_CHECK_INTERVAL)
+        while True:
+            time.sleep(interval)
+            try:
+                self.report(publish(options['dir'], keep=keep))
+            except OSError as e:
+                logger.error(f"Publishing failed: {e}")
+
+    def report(self, version):
+        if version:
+            self.stdout.write(self.style.SUCCESS(f"Published {version}"))
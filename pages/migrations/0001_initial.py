@@ -0,0 +1,49 @@
+# Generated by Django 5.1.5 on 2026-10-18 12:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Venue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('eircode', models.CharField(max_length=16, unique=True)),
+                ('latitude', models.FloatField(null=True)),
+                ('longitude', models.FloatField(null=True)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('ingested_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['latitude', 'longitude'], name='pages_venue_latitud_b4e5ce_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('eircode', models.CharField(max_length=16)),
+                ('name', models.CharField(max_length=255)),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('duration', models.CharField(max_length=32)),
+                ('recurrence', models.JSONField(null=True)),
+                ('extracted_time', models.DateTimeField(null=True)),
+                ('extracted_url', models.URLField(blank=True, max_length=500)),
+                ('latitude', models.FloatField(null=True)),
+                ('longitude', models.FloatField(null=True)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='pages.venue')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['start_time'], name='pages_event_start_t_2d6f54_idx'), models.Index(fields=['eircode', 'start_time'], name='pages_event_eircode_9c4d21_idx'), models.Index(fields=['latitude', 'longitude'], name='pages_event_latitud_e25e9f_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,51 @@
 from django.db import models
 
-# Create your models here.
+
+class Venue(models.Model):
+    """
+    A venue with extracted events, keyed by eircode.
+
+    content_hash is the hash of the extraction file its events were last
+    ingested from, so unchanged files can be skipped.
+    """
+    eircode = models.CharField(max_length=16, unique=True)
+    latitude = models.FloatField(null=True)
+    longitude = models.FloatField(null=True)
+    content_hash = models.CharField(max_length=64)
+    ingested_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['latitude', 'longitude']),
+        ]
+
+    def __str__(self):
+        return self.eircode
+
+
+class Event(models.Model):
+    """
+    One extracted event. eircode and the coordinates are copied from the
+    venue so common filters need no join.
+    """
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='events')
+    eircode = models.CharField(max_length=16)
+    name = models.CharField(max_length=255)
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    duration = models.CharField(max_length=32)
+    recurrence = models.JSONField(null=True)
+    extracted_time = models.DateTimeField(null=True)
+    extracted_url = models.URLField(max_length=500, blank=True)
+    latitude = models.FloatField(null=True)
+    longitude = models.FloatField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['start_time']),
+            models.Index(fields=['eircode', 'start_time']),
+            models.Index(fields=['latitude', 'longitude']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.eircode})"
@@ -0,0 +1,154 @@
+import gzip
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from django.contrib.staticfiles import finders
+from django.template.loader import render_to_string
+
+from .event_index import EventIndex
+from .extraction import get_event_cache
+
+logger = logging.getLogger(__name__)
+
+RELEASES = 'releases'
+CURRENT = 'current'
+# URL prefixes nginx maps onto the publish directory
+RELEASES_URL = '/releases/'
+MANIFEST_URL = '/data/manifest.json'
+# Precompressed alongside the original for nginx's gzip_static
+COMPRESSED_SUFFIXES = ('.html', '.json', '.js', '.css', '.svg', '.txt')
+
+
+def write_file(path, data):
+    """
+    Write data to path, plus a gzipped copy at path.gz for compressible types.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    if path.suffix in COMPRESSED_SUFFIXES:
+        (path.parent / f"{path.name}.gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def day_shards(index):
+    """
+    {YYYY-MM-DD: events} with each event under every UTC day it runs on, so
+    a calendar range needs only the shards of the days it covers.
+    """
+    shards = {}
+    for event, start, end in zip(index.events, index.starts, index.ends):
+        day = datetime.fromtimestamp(start, timezone.utc).date()
+        last = datetime.fromtimestamp(max(start, end - 1), timezone.utc).date()
+        while day <= last:
+            shards.setdefault(day.isoformat(), []).append(event)
+            day += timedelta(days=1)
+    return shards
+
+
+def copy_static(release_dir):
+    """
+    Copy every static file the finders know of into release_dir/static.
+    """
+    for finder in finders.get_finders():
+        for path, storage in finder.list([]):
+            target = release_dir / 'static' / path
+            if target.exists():
+                continue  # The first finder to provide a path wins, as with collectstatic
+            with storage.open(path) as f:
+                write_file(target, f.read())
+
+
+def prune_releases(releases_dir, keep):
+    """
+    Delete all but the newest keep releases. Pages already open on an older
+    release keep working until it is pruned.
+    """
+    releases = sorted(
+        (path for path in releases_dir.iterdir() if path.is_dir() and not path.name.startswith('.')),
+        key=lambda path: path.stat().st_mtime,
+    )
+    for path in releases[:-keep]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def published_version(publish_dir):
+    """
+    The version current points at, or None before the first publish.
+    """
+    try:
+        return Path(os.readlink(Path(publish_dir) / CURRENT)).name
+    except (FileNotFoundError, OSError):
+        return None
+
+
+def publish(publish_dir, keep=3, force=False):
+    """
+    Render the events page and its data for the current event cache version
+    into publish_dir/releases/<version>, then point publish_dir/current at it.
+
+    The release is built under a temporary name and renamed into place, and
+    current is a symlink replaced with a rename, so nginx serves either the
+    old release or the new one, never a mix. Returns the version published,
+    or None if it was already current.
+    """
+    publish_dir = Path(publish_dir)
+    snapshot = get_event_cache().snapshot
+    version = snapshot['version']
+    if not force and published_version(publish_dir) == version:
+        return None
+
+    releases_dir = publish_dir / RELEASES
+    releases_dir.mkdir(parents=True, exist_ok=True)
+    release = releases_dir / version
+    if force or not release.is_dir():
+        build_release(releases_dir, release, snapshot)
+    else:
+        os.utime(release)  # The data went back to a release still on disk
+
+    # Relative, so the link resolves wherever the directory is mounted
+    link = publish_dir / f".{CURRENT}.{os.getpid()}"
+    link.unlink(missing_ok=True)
+    os.symlink(Path(RELEASES) / version, link)
+    os.replace(link, publish_dir / CURRENT)
+
+    prune_releases(releases_dir, keep)
+    return version
+
+
+def build_release(releases_dir, release, snapshot):
+    """
+    Render the page, data shards and static files of one version and
+    rename them into place as release.
+    """
+    version = snapshot['version']
+    building = releases_dir / f".{version}.{os.getpid()}"
+    shutil.rmtree(building, ignore_errors=True)
+
+    index = EventIndex(snapshot['events'], version, snapshot['modified'])
+    shards = day_shards(index)
+    data_dir = building / 'data'
+    for day, events in shards.items():
+        write_file(data_dir / f"{day}.json", json.dumps(events, separators=(',', ':')).encode('utf-8'))
+    manifest = {
+        'version': version,
+        'generated': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'base': f"{RELEASES_URL}{version}/data/",
+        'days': sorted(shards),
+    }
+    write_file(data_dir / 'manifest.json', json.dumps(manifest, separators=(',', ':')).encode('utf-8'))
+    html = render_to_string('events_view.html', {'static_manifest': MANIFEST_URL})
+    write_file(building / 'index.html', html.encode('utf-8'))
+    copy_static(building)
+
+    if release.exists():
+        # Rebuilding in place (--force): swap the old copy out first
+        replaced = releases_dir / f".{version}.old.{os.getpid()}"
+        os.replace(release, replaced)
+        os.replace(building, release)
+        shutil.rmtree(replaced, ignore_errors=True)
+    else:
+        os.replace(building, release)
+    logger.info(f"Built release {version}: {len(index)} events in {len(shards)} day shards")
@@ -0,0 +1,147 @@
+import heapq
+import math
+
+EARTH_RADIUS_M = 6371008.8
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """
+    Great-circle distance in metres between two points.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+class VenueIndex:
+    """
+    A static 2-d tree over venues, built once per set of events.
+
+    Points are (longitude * cos(mean latitude), latitude), an equirectangular
+    projection that keeps distances close to true at city or county scale.
+    Nodes live in parallel lists indexed by node number rather than as
+    objects, which keeps building and walking the tree cheap.
+    """
+
+    def __init__(self, venues):
+        """
+        venues is a list of dicts with at least latitude and longitude.
+        """
+        self.venues = [venue for venue in venues if _has_coordinates(venue)]
+        mean_lat = sum(v['latitude'] for v in self.venues) / len(self.venues) if self.venues else 0
+        self._x_scale = math.cos(math.radians(mean_lat))
+        points = [(self._project(v['longitude'], v['latitude']), i) for i, v in enumerate(self.venues)]
+        # Per node: point, venue position, left child, right child (-1 for none)
+        self._points = []
+        self._venue = []
+        self._left = []
+        self._right = []
+        self._root = self._build(points, 0)
+
+    @classmethod
+    def from_events(cls, events):
+        """
+        One venue per eircode, with its coordinates and number of events.
+        """
+        venues = {}
+        for event in events:
+            if not _has_coordinates(event):
+                continue
+            eircode = event.get('eircode') or f"{event['longitude']},{event['latitude']}"
+            venue = venues.get(eircode)
+            if venue is None:
+                venues[eircode] = {
+                    'eircode': eircode,
+                    'latitude': event['latitude'],
+                    'longitude': event['longitude'],
+                    'events': 1,
+                }
+            else:
+                venue['events'] += 1
+        return cls(list(venues.values()))
+
+    def __len__(self):
+        return len(self.venues)
+
+    def _project(self, lng, lat):
+        return (lng * self._x_scale, lat)
+
+    def _build(self, points, depth):
+        if not points:
+            return -1
+        axis = depth % 2
+        points.sort(key=lambda p: p[0][axis])
+        middle = len(points) // 2
+        node = len(self._points)
+        self._points.append(points[middle][0])
+        self._venue.append(points[middle][1])
+        self._left.append(-1)
+        self._right.append(-1)
+        self._left[node] = self._build(points[:middle], depth + 1)
+        self._right[node] = self._build(points[middle + 1:], depth + 1)
+        return node
+
+    def within(self, bbox):
+        """
+        Venues inside bbox = (min_lng, min_lat, max_lng, max_lat).
+        """
+        min_lng, min_lat, max_lng, max_lat = bbox
+        low = self._project(min_lng, min_lat)
+        high = self._project(max_lng, max_lat)
+        found = []
+        stack = [(self._root, 0)] if self._root != -1 else []
+        while stack:
+            node, axis = stack.pop()
+            point = self._points[node]
+            if low[0] <= point[0] <= high[0] and low[1] <= point[1] <= high[1]:
+                found.append(self.venues[self._venue[node]])
+            if self._left[node] != -1 and low[axis] <= point[axis]:
+                stack.append((self._left[node], 1 - axis))
+            if self._right[node] != -1 and point[axis] <= high[axis]:
+                stack.append((self._right[node], 1 - axis))
+        return found
+
+    def nearest(self, lat, lng, k=5):
+        """
+        The k venues nearest (lat, lng), closest first, as
+        (distance in metres, venue) pairs.
+        """
+        if k <= 0 or self._root == -1:
+            return []
+        target = self._project(lng, lat)
+        # Max-heap of (-squared distance, venue position) holding the best k so far
+        best = []
+        # Entries carry the squared distance to their splitting line, a lower
+        # bound on anything beneath them, rechecked as better candidates turn up
+        stack = [(self._root, 0, 0.0)]
+        while stack:
+            node, axis, bound = stack.pop()
+            if len(best) == k and bound >= -best[0][0]:
+                continue
+            point = self._points[node]
+            dist = (point[0] - target[0]) ** 2 + (point[1] - target[1]) ** 2
+            if len(best) < k:
+                heapq.heappush(best, (-dist, self._venue[node]))
+            elif dist < -best[0][0]:
+                heapq.heapreplace(best, (-dist, self._venue[node]))
+
+            diff = target[axis] - point[axis]
+            near, far = (self._left[node], self._right[node]) if diff < 0 else (self._right[node], self._left[node])
+            # Far side first so the near side is searched first
+            if far != -1:
+                stack.append((far, 1 - axis, max(bound, diff * diff)))
+            if near != -1:
+                stack.append((near, 1 - axis, bound))
+
+        results = []
+        for _, position in best:
+            venue = self.venues[position]
+            results.append((haversine_m(lat, lng, venue['latitude'], venue['longitude']), venue))
+        results.sort(key=lambda result: result[0])
+        return results
+
+
+def _has_coordinates(item):
+    return isinstance(item.get('latitude'), (int, float)) and isinstance(item.get('longitude'), (int, float))
@@ -5,6 +5,7 @@ class MapManager {
             attribution: '© OpenStreetMap contributors, © CARTO'
         }).addTo(this.map);
         this.markers = L.layerGroup().addTo(this.map);
+        this.venueMarkers = {};
         this.locationColors = {};
     }
 
@@ -29,9 +30,18 @@ class MapManager {
 
     clearMarkers() {
         this.markers.clearLayers();
+        this.venueMarkers = {};
     }
 
-    addLocationMarker(location, events) {
+    removeVenueMarker(eircode) {
+        const marker = this.venueMarkers[eircode];
+        if (marker) {
+            this.markers.removeLayer(marker);
+            delete this.venueMarkers[eircode];
+        }
+    }
+
+    addLocationMarker(location, events, eircode) {
         const color = this.locationColors[`${location.lng},${location.lat}`];
         const marker = L.marker([location.lat, location.lng], {
             icon: L.divIcon({
@@ -134,6 +144,11 @@ class MapManager {
                 }
             );
         this.markers.addLayer(marker);
+        if (eircode) {
+            this.removeVenueMarker(eircode);
+            this.venueMarkers[eircode] = marker;
+        }
+        return marker;
     }
 
     formatEventTime(timeString) {
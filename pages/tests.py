@@ -1,3 +1,57 @@
-from django.test import TestCase
+import tempfile
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from pages import event_index, extraction
+from pages.benchmark import CENTRE, generate_corpus
+
+
+class NearestVenuesApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.extraction_dir = tempfile.TemporaryDirectory()
+        generate_corpus(cls.extraction_dir.name, venues=20, events_per_venue=8)
+        cls.settings_override = override_settings(EXTRACTION_DIR=cls.extraction_dir.name)
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.extraction_dir.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        # The event cache and index are process-wide; start each test from this directory
+        extraction._event_cache = None
+        event_index._index = None
+
+    def get(self, **params):
+        return self.client.get('/api/venues/nearest', params, HTTP_HOST='localhost')
+
+    def test_nearest_venues_closest_first(self):
+        response = self.get(lat=CENTRE[0], lng=CENTRE[1], k=3)
+        self.assertEqual(response.status_code, 200)
+        distances = [venue['distance_m'] for venue in response.json()['venues']]
+        self.assertEqual(len(distances), 3)
+        self.assertEqual(distances, sorted(distances))
+
+    def test_missing_coordinates(self):
+        self.assertEqual(self.get(lat=53).status_code, 400)
+
+    def test_non_finite_k(self):
+        self.assertEqual(self.get(lat=53, lng=-6, k='nan').status_code, 400)
+        self.assertEqual(self.get(lat=53, lng=-6, k='inf').status_code, 400)
+
+    def test_non_integer_k(self):
+        self.assertEqual(self.get(lat=53, lng=-6, k='2.5').status_code, 400)
+        self.assertEqual(self.get(lat=53, lng=-6, k='many').status_code, 400)
+
+    def test_non_finite_coordinates(self):
+        self.assertEqual(self.get(lat='nan', lng=-6).status_code, 400)
+        self.assertEqual(self.get(lat=53, lng='nan').status_code, 400)
+        self.assertEqual(self.get(lat='inf', lng=-6).status_code, 400)
+
+    def test_out_of_range_coordinates(self):
+        self.assertEqual(self.get(lat=91, lng=-6).status_code, 400)
+        self.assertEqual(self.get(lat=53, lng=-181).status_code, 400)
@@ -0,0 +1,158 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .extraction import get_event_cache
+
+# Data versions kept to diff reconnecting clients against; clients further
+# behind are told to reload
+HISTORY_VERSIONS = 8
+# Deltas with more events than this are sent as a reload instead
+MAX_DELTA_EVENTS = 2000
+# Seconds between keepalive comments, so proxies do not close idle streams
+KEEPALIVE_INTERVAL = 15
+# Milliseconds the browser waits before reconnecting a closed stream
+RETRY_MS = 5000
+
+
+class VersionHistory:
+    """
+    The events of the last few data versions, and the deltas between them.
+
+    Snapshots are shared with the event cache, so keeping one costs only a
+    reference. Each delta is computed once, however many clients need it.
+    """
+
+    def __init__(self, max_versions):
+        self.max_versions = max_versions
+        self._events = OrderedDict()
+        self._deltas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, version, events):
+        with self._lock:
+            self._events[version] = events
+            self._events.move_to_end(version)
+            while len(self._events) > self.max_versions:
+                self._events.popitem(last=False)
+
+    def delta(self, old_version, new_version):
+        """
+        {from, version, added, changed, removed, venues} taking a client from
+        old_version to new_version, or None if either version is no longer
+        held, an event has no ID, or the delta is too large to be worth it.
+        """
+        key = (old_version, new_version)
+        with self._lock:
+            if key in self._deltas:
+                return self._deltas[key]
+            old_events = self._events.get(old_version)
+            new_events = self._events.get(new_version)
+        if old_events is None or new_events is None:
+            return None
+
+        delta = diff_events(old_events, new_events)
+        if delta is not None:
+            delta = {'from': old_version, 'version': new_version, **delta}
+        with self._lock:
+            self._deltas[key] = delta
+            while len(self._deltas) > self.max_versions:
+                self._deltas.popitem(last=False)
+        return delta
+
+
+def diff_events(old_events, new_events):
+    """
+    Events added, changed and removed (by ID) between two versions, plus the
+    eircodes of every venue they belong to. None if any event lacks an ID
+    or more than MAX_DELTA_EVENTS changed.
+    """
+    if any(not event.get('id') for events in (old_events, new_events) for event in events):
+        return None
+    before = {event['id']: event for event in old_events}
+    after = {event['id']: event for event in new_events}
+    added = [event for id_, event in after.items() if id_ not in before]
+    changed = [event for id_, event in after.items() if id_ in before and before[id_] != event]
+    removed = [id_ for id_ in before if id_ not in after]
+    if len(added) + len(changed) + len(removed) > MAX_DELTA_EVENTS:
+        return None
+    venues = {event.get('eircode') for event in added + changed}
+    venues.update(before[id_].get('eircode') for id_ in removed)
+    return {
+        'added': added,
+        'changed': changed,
+        'removed': removed,
+        'venues': sorted(eircode for eircode in venues if eircode),
+    }
+
+
+_history = VersionHistory(HISTORY_VERSIONS)
+
+
+def current_version():
+    """
+    The event cache's current version, recorded in the history.
+    """
+    snapshot = get_event_cache().snapshot
+    _history.record(snapshot['version'], snapshot['events'])
+    return snapshot['version']
+
+
+def sse_message(event, data, id_=None):
+    lines = []
+    if id_ is not None:
+        lines.append(f"id: {id_}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+
+class UpdateStream:
+    """
+    The messages of one server-sent-events connection.
+
+    The first message is "version" when the client is current or new, a
+    "delta" when it is behind by a version still held, or "reload"
+    otherwise; after that, one "delta" or "reload" per data change. Each
+    carries the version as its event ID, which the browser sends back as
+    Last-Event-ID when it reconnects, so nothing is missed across
+    reconnects.
+    """
+
+    def __init__(self, client_version=None):
+        self.client_version = client_version
+        self.started = time.monotonic()
+        self.last_sent = self.started
+
+    @property
+    def expired(self):
+        return time.monotonic() - self.started >= settings.EVENT_UPDATES_MAX_SECONDS
+
+    def opening(self):
+        return f"retry: {RETRY_MS}\n\n" + (self.poll() or '')
+
+    def poll(self):
+        """
+        The next message to send, if the data changed since the last one.
+        """
+        version = current_version()
+        if version == self.client_version:
+            if time.monotonic() - self.last_sent >= KEEPALIVE_INTERVAL:
+                self.last_sent = time.monotonic()
+                return ": keepalive\n\n"
+            return None
+
+        if self.client_version is None:
+            message = sse_message('version', {'version': version}, version)
+        else:
+            delta = _history.delta(self.client_version, version)
+            if delta is None:
+                message = sse_message('reload', {'version': version}, version)
+            else:
+                message = sse_message('delta', delta, version)
+        self.client_version = version
+        self.last_sent = time.monotonic()
+        return message